@@ -0,0 +1,56 @@
+"""Seeded generation of synthetic sentences in several scripts for the benchmarks."""
+from random import Random
+
+__all__ = [
+    'generate_answer',
+    'generate_sentence',
+    'SCRIPTS',
+]
+
+LATIN = 'abcdefghijklmnopqrstuvwxyzéèàçñ'
+CYRILLIC = 'абвгдеєжзиіїйклмнопрстуфхцчшщьюя'
+CJ = (
+    '的一是不了人我在有他这中大来上国个到说们为子和你地出道也时年得就那要下以生会自着去之过家学对可她里后小么心多天而能好都然'
+    'あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん'
+)
+PUNCTUATION = ',.;:!?'
+
+SCRIPTS = {
+    'latin': LATIN,
+    'cyrillic': CYRILLIC,
+    'cj': CJ,
+}
+
+
+def generate_sentence(rng: Random, script: str, tokens: int) -> str:
+    """Generate a sentence of the given number of tokens (words, or characters for CJ) in the script."""
+    alphabet = SCRIPTS[script]
+    if script == 'cj':
+        body = ''.join(
+            char + (rng.choice('、，') if rng.random() < 0.08 else '')
+            for char in rng.choices(alphabet, k=tokens)
+        )
+        return body + '。'
+    words = [''.join(rng.choices(alphabet, k=rng.randint(1, 10))) for _ in range(tokens)]
+    return ' '.join(
+        word + (rng.choice(PUNCTUATION[:2]) if rng.random() < 0.08 else '')
+        for word in words
+    ).capitalize() + '.'
+
+
+def generate_answer(rng: Random, sentence: str, script: str, mistake_rate: float = 0.1) -> str:
+    """Generate a learner's answer by substituting, dropping, and inserting characters of the sentence."""
+    alphabet = SCRIPTS[script]
+    chars: list[str] = []
+    for char in sentence:
+        if rng.random() >= mistake_rate:
+            chars.append(char)
+            continue
+        match rng.randrange(3):
+            case 0:
+                chars.append(rng.choice(alphabet))
+            case 1:
+                pass
+            case _:
+                chars.extend([char, rng.choice(alphabet)])
+    return ''.join(chars)
@@ -0,0 +1,55 @@
+"""
+Benchmark of `finalize_scoring` as the set of perfect options collected from previous exams grows.
+
+Usage: python benchmarks/finalize_scoring.py [--repeat N] [--seed S]
+"""
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+
+from corpus import generate_answer
+
+from reling.app.commands.exam.scoring import finalize_scoring
+from reling.helpers.scoring import calculate_diff_score
+
+SENTENCE = 'In a small town there lived a young girl named Emily who loved learning new languages every summer.'
+OPTION_COUNTS = [1, 10, 100, 1000]
+ANSWER_MISTAKE_RATE = 0.04
+OPTION_MISTAKE_RATE = 0.12
+
+
+def run_naive(answer: str, options: list[str]) -> int:
+    """Score the answer against every option, as finalize_scoring did before pruning."""
+    return max(calculate_diff_score(answer, option) for option in options)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{'Options':>8} {'Pruned, ms':>12} {'Naive, ms':>12}')
+    for count in OPTION_COUNTS:
+        rng = Random(args.seed)
+        answers = [generate_answer(rng, SENTENCE, 'latin', ANSWER_MISTAKE_RATE) for _ in range(args.repeat)]
+        options = {SENTENCE} | {generate_answer(rng, SENTENCE, 'latin', OPTION_MISTAKE_RATE) for _ in range(count - 1)}
+
+        start = perf_counter()
+        for answer in answers:
+            finalize_scoring(answer, default_score=None, default_suggestion=None, perfect_options=options)
+        pruned = (perf_counter() - start) / len(answers)
+
+        if count <= OPTION_COUNTS[-2]:
+            start = perf_counter()
+            for answer in answers:
+                run_naive(answer, sorted(options))
+            naive = f'{(perf_counter() - start) / len(answers) * 1000:12.1f}'
+        else:
+            naive = f'{'-':>12}'
+
+        print(f'{len(options):>8} {pruned * 1000:12.1f} {naive}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark of the grammar cache formats: one row per word versus interned strings with packed sentences.
+A seeded cache is built in the previous format and migrated; the database sizes and the throughput of the
+cached lookups performed by `stats --grammar` are compared.
+
+Usage: python benchmarks/grammar_cache.py [--sentences N] [--seed S]
+"""
+from argparse import ArgumentParser
+from itertools import batched
+from pathlib import Path
+from random import Random
+import shutil
+import sqlite3
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from corpus import generate_sentence
+
+from reling.db import init_db, migrate, single_session
+from reling.db.models import Language
+from reling.helpers.grammar import Analyzer, QUERY_CHUNK_SIZE, WordInfo
+from reling.shelf import init_shelf
+
+LANGUAGE = 'en'
+UPOS = ['ADJ', 'ADP', 'ADV', 'AUX', 'CCONJ', 'DET', 'NOUN', 'NUM', 'PART', 'PRON', 'PROPN', 'SCONJ', 'VERB']
+VOCABULARY_SIZE = 5000
+MIN_WORDS = 5
+MAX_WORDS = 20
+
+PREVIOUS_SCHEMA = """
+CREATE TABLE languages (id VARCHAR NOT NULL, short_code VARCHAR NOT NULL, name VARCHAR NOT NULL,
+    extra_name_a VARCHAR, extra_name_b VARCHAR, PRIMARY KEY (id));
+CREATE TABLE grammar_cache_sentences (id VARCHAR NOT NULL, language_id VARCHAR NOT NULL, sentence VARCHAR NOT NULL,
+    PRIMARY KEY (id), FOREIGN KEY(language_id) REFERENCES languages (id));
+CREATE UNIQUE INDEX grammar_cache_sentence_language_sentence ON grammar_cache_sentences (language_id, sentence);
+CREATE TABLE grammar_cache_words (sentence_id VARCHAR NOT NULL, "index" INTEGER NOT NULL, text VARCHAR NOT NULL,
+    lemma VARCHAR NOT NULL, upos VARCHAR NOT NULL, PRIMARY KEY (sentence_id, "index"),
+    FOREIGN KEY(sentence_id) REFERENCES grammar_cache_sentences (id) ON DELETE CASCADE ON UPDATE CASCADE);
+"""
+
+PREVIOUS_LOOKUP = """
+SELECT sentences.sentence, words.text, words.lemma, words.upos
+FROM grammar_cache_sentences sentences LEFT JOIN grammar_cache_words words ON words.sentence_id = sentences.id
+WHERE sentences.language_id = ? AND sentences.sentence IN ({placeholders})
+ORDER BY sentences.id, words."index"
+"""
+
+
+def generate_cache(rng: Random, sentences: int) -> dict[str, list[WordInfo]]:
+    """Generate analyses of distinct sentences, with words drawn from a Zipf-distributed vocabulary."""
+    vocabulary = [
+        WordInfo(text=form, lemma=form[:-1] or form, upos=rng.choice(UPOS))
+        for form in (generate_sentence(rng, 'latin', 1).rstrip('.') for _ in range(VOCABULARY_SIZE))
+    ]
+    weights = [1 / rank for rank in range(1, VOCABULARY_SIZE + 1)]
+    return {
+        f'Sentence {index}.': rng.choices(vocabulary, weights, k=rng.randint(MIN_WORDS, MAX_WORDS))
+        for index in range(sentences)
+    }
+
+
+def write_previous_format(database: Path, cache: dict[str, list[WordInfo]]) -> None:
+    """Write the cache in the previous format, with one row per word."""
+    connection = sqlite3.connect(database)
+    connection.executescript(PREVIOUS_SCHEMA)
+    connection.execute('INSERT INTO languages VALUES (?, ?, ?, NULL, NULL)', (LANGUAGE, LANGUAGE, 'English'))
+    for index, (sentence, words) in enumerate(cache.items()):
+        sentence_id = f'{index:012}'
+        connection.execute('INSERT INTO grammar_cache_sentences VALUES (?, ?, ?)', (sentence_id, LANGUAGE, sentence))
+        connection.executemany(
+            'INSERT INTO grammar_cache_words VALUES (?, ?, ?, ?, ?)',
+            [(sentence_id, word_index, word.text, word.lemma, word.upos) for word_index, word in enumerate(words)],
+        )
+    connection.commit()
+    connection.execute('VACUUM')
+    connection.close()
+
+
+def read_previous_format(database: Path, sentences: list[str]) -> dict[str, list[WordInfo]]:
+    """Look the sentences up in the previous format, as the analyzer did."""
+    connection = sqlite3.connect(database)
+    analyses: dict[str, list[WordInfo]] = {}
+    for chunk in batched(sentences, QUERY_CHUNK_SIZE):
+        for sentence, text, lemma, upos in connection.execute(
+                PREVIOUS_LOOKUP.format(placeholders=', '.join('?' * len(chunk))),
+                (LANGUAGE, *chunk),
+        ):
+            words = analyses.setdefault(sentence, [])
+            if text is not None:
+                words.append(WordInfo(text=text, lemma=lemma, upos=upos))
+    connection.close()
+    return analyses
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--sentences', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    cache = generate_cache(Random(args.seed), args.sentences)
+    sentences = list(cache)
+    with TemporaryDirectory() as directory:
+        previous = Path(directory) / 'previous.db'
+        packed = Path(directory) / 'packed.db'
+        write_previous_format(previous, cache)
+        shutil.copy(previous, packed)
+
+        start = perf_counter()
+        migrate(packed, 'f')
+        migration = perf_counter() - start
+
+        start = perf_counter()
+        assert read_previous_format(previous, sentences) == cache
+        previous_lookup = perf_counter() - start
+
+        init_shelf(Path(directory) / 'shelf')
+        init_db(f'sqlite:///{packed}')
+        with single_session() as session:
+            analyzer = Analyzer.get(session.get(Language, LANGUAGE))
+        start = perf_counter()
+        assert analyzer.analyze_many(sentences) == list(cache.values())
+        packed_lookup = perf_counter() - start
+
+        print(f'Sentences: {len(sentences)}, words: {sum(map(len, cache.values()))}, '
+              f'migration: {migration:.2f} s')
+        print(f'{'Format':<12} {'Size, MB':>10} {'Lookups/s':>12}')
+        for name, database, lookup in [
+            ('per word', previous, previous_lookup),
+            ('packed', packed, packed_lookup),
+        ]:
+            print(f'{name:<12} {database.stat().st_size / 1024 / 1024:10.2f} {len(sentences) / lookup:12.0f}')
+
+
+if __name__ == '__main__':
+    main()
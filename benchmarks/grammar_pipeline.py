@@ -0,0 +1,50 @@
+"""
+Benchmark of the Stanza analysis of uncached sentences: one pipeline call per sentence versus batched documents.
+Requires Stanza and downloads the English models on the first run.
+
+Usage: python benchmarks/grammar_pipeline.py [--sentences N] [--seed S]
+"""
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+
+from corpus import generate_sentence
+
+from reling.db.models import Language
+from reling.helpers.grammar import Analyzer
+
+BATCH_SIZES = [1, 8, 64, 256]
+MIN_TOKENS = 5
+MAX_TOKENS = 20
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--sentences', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    sentences = [
+        generate_sentence(rng, 'latin', rng.randint(MIN_TOKENS, MAX_TOKENS))
+        for _ in range(args.sentences)
+    ]
+    analyzer = Analyzer.get(Language(id='en', short_code='en', name='English'))
+    analyzer.run_pipeline(sentences[:10])  # Warm up the models
+
+    start = perf_counter()
+    expected = [analyzer.run_pipeline([sentence])[0] for sentence in sentences]
+    loop = perf_counter() - start
+    print(f'{'Mode':<20} {'Sentences/s':>12} {'Speedup':>8} {'Differing':>10}')
+    print(f'{'per sentence':<20} {len(sentences) / loop:12.1f} {1:8.2f} {0:10}')
+
+    for batch_size in BATCH_SIZES:
+        start = perf_counter()
+        words = analyzer.run_pipeline(sentences, batch_size)
+        elapsed = perf_counter() - start
+        differing = sum(batch_words != sentence_words for batch_words, sentence_words in zip(words, expected))
+        print(f'{f'batch of {batch_size}':<20} {len(sentences) / elapsed:12.1f} {loop / elapsed:8.2f} {differing:10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Benchmark of `highlight_diff` on long generated texts with scattered mistakes.
+
+Usage: python benchmarks/highlight_diff.py [--repeat N] [--seed S]
+"""
+from argparse import ArgumentParser
+from random import Random
+from timeit import timeit
+
+from corpus import generate_answer, generate_sentence
+
+from reling.helpers.diff import highlight_diff
+
+WORD_COUNTS = [10, 50, 100, 200]
+MISTAKE_RATE = 0.03
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    print(f'{'Words':>6} {'Characters':>11} {'ms/call':>10}')
+    for word_count in WORD_COUNTS:
+        better = generate_sentence(rng, 'latin', word_count)
+        worse = generate_answer(rng, better, 'latin', MISTAKE_RATE)
+        seconds = timeit(lambda: highlight_diff(worse, better), number=args.repeat) / args.repeat
+        print(f'{word_count:>6} {len(better):>11} {seconds * 1000:10.1f}')
+
+
+if __name__ == '__main__':
+    main()
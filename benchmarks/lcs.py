@@ -0,0 +1,42 @@
+"""
+Micro-benchmark of the bit-parallel LCS length against lcs2 on paragraph-sized sentences.
+
+Usage: python benchmarks/lcs.py [--repeat N] [--seed S]
+"""
+from argparse import ArgumentParser
+from random import Random
+from timeit import timeit
+
+from lcs2 import lcs_length as reference_lcs_length
+
+from corpus import generate_answer, generate_sentence
+
+from reling.utils.lcs import lcs_length, LcsPattern
+
+LENGTHS = [20, 100, 300, 1000]
+MISTAKE_RATE = 0.2
+REFERENCE_MAX_LENGTH = 300
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    print(f'{'Length':>8} {'Bit-parallel, µs':>18} {'Prepared, µs':>14} {'lcs2, µs':>12}')
+    for length in LENGTHS:
+        a = generate_sentence(rng, 'latin', length)[:length]
+        b = generate_answer(rng, a, 'latin', MISTAKE_RATE)
+        pattern = LcsPattern(a)
+        assert pattern.lcs_length(b) == lcs_length(a, b)
+        bit_parallel = timeit(lambda: lcs_length(a, b), number=args.repeat) / args.repeat
+        prepared = timeit(lambda: pattern.lcs_length(b), number=args.repeat) / args.repeat
+        reference = (f'{timeit(lambda: reference_lcs_length(a, b), number=1) * 1e6:12.0f}'
+                     if length <= REFERENCE_MAX_LENGTH else f'{'-':>12}')
+        print(f'{length:>8} {bit_parallel * 1e6:18.1f} {prepared * 1e6:14.1f} {reference}')
+
+
+if __name__ == '__main__':
+    main()
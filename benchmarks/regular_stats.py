@@ -0,0 +1,176 @@
+"""
+Benchmark of the regular statistics: replaying the exams (with their results loaded per exam) in Python versus
+aggregating them in SQL. A seeded database of synthetic text and dialogue exams is generated; both computations
+must produce identical statistics.
+
+Usage: python benchmarks/regular_stats.py [--exams N] [--checkpoints K] [--seed S]
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import cast
+
+from sqlalchemy import insert
+
+from reling.db import init_db, single_session
+
+# The database must be initialized before the app is imported, as the app would otherwise initialize its own
+DIRECTORY = TemporaryDirectory()
+init_db(f'sqlite:///{Path(DIRECTORY.name) / 'reling.db'}')
+
+from reling.app.commands.stats.filter import get_filter
+from reling.app.commands.stats.modalities import Modality
+from reling.app.commands.stats.regular_stats import Checkpoint, compute_stats, PeriodStats, Stats, TypeStats
+from reling.db.enums import Gender, Level
+from reling.db.models import Dialogue, DialogueExam, DialogueExamResult, Language, Text, TextExam, TextExamResult
+
+LANGUAGES = ['en', 'de', 'fr', 'es']
+CONTENTS = 2000
+MIN_RESULTS = 3
+MAX_RESULTS = 15
+MAX_SCORE = 10
+START = datetime(2020, 1, 1)
+PERIOD = timedelta(days=4 * 365)
+INSERT_BATCH_SIZE = 10000
+
+
+def generate_database(rng: Random, exams: int) -> None:
+    """Fill the database with languages, texts, dialogues, and exams spread over the period."""
+    with single_session() as session:
+        session.execute(insert(Language), [
+            {'id': language, 'short_code': language, 'name': language.upper()}
+            for language in LANGUAGES
+        ])
+        session.execute(insert(Text), [
+            {'id': f'text{index}', 'language_id': rng.choice(LANGUAGES), 'level': Level.BASIC,
+             'topic': '', 'style': '', 'created_at': START, 'archived_at': None}
+            for index in range(CONTENTS)
+        ])
+        session.execute(insert(Dialogue), [
+            {'id': f'dialogue{index}', 'language_id': rng.choice(LANGUAGES), 'level': Level.BASIC, 'speaker': '',
+             'topic': None, 'speaker_gender': Gender.MALE, 'user_gender': Gender.FEMALE, 'created_at': START,
+             'archived_at': None}
+            for index in range(CONTENTS)
+        ])
+        for offset in range(0, exams, INSERT_BATCH_SIZE):
+            rows: dict[type, list[dict]] = {TextExam: [], DialogueExam: [], TextExamResult: [], DialogueExamResult: []}
+            for index in range(offset, min(offset + INSERT_BATCH_SIZE, exams)):
+                is_text = rng.random() < 0.6
+                source, target = rng.sample(LANGUAGES, 2)
+                started_at = START + PERIOD * rng.random()
+                exam_id = f'exam{index}'
+                content_id = f'{'text' if is_text else 'dialogue'}{rng.randrange(CONTENTS)}'
+                rows[TextExam if is_text else DialogueExam].append({
+                    'id': exam_id,
+                    'text_id' if is_text else 'dialogue_id': content_id,
+                    'source_language_id': source,
+                    'target_language_id': target,
+                    'read_source': False,
+                    'read_target': False,
+                    'listened': False,
+                    'scanned': False,
+                    'started_at': started_at,
+                    'finished_at': started_at + timedelta(seconds=rng.uniform(30, 1800)),
+                    'total_pause_time': timedelta(seconds=rng.uniform(0, 20)),
+                })
+                rows[TextExamResult if is_text else DialogueExamResult].extend({
+                    'text_exam_id' if is_text else 'dialogue_exam_id': exam_id,
+                    'text_sentence_index' if is_text else 'dialogue_exchange_index': result_index,
+                    'answer': '',
+                    'suggested_answer': None,
+                    'score': rng.randint(0, MAX_SCORE),
+                } for result_index in range(rng.randint(MIN_RESULTS, MAX_RESULTS)))
+            for model, model_rows in rows.items():
+                if model_rows:
+                    session.execute(insert(model), model_rows)
+        session.commit()
+
+
+def compute_stats_by_replay(
+        language: Language,
+        paired: list[Language] | None,
+        modality: Modality,
+        checkpoints: list[datetime],
+) -> PeriodStats:
+    """Compute the statistics as before, by loading the exams and their results and replaying them in order."""
+    with single_session() as session:
+        stats = PeriodStats(
+            all_time=TypeStats(),
+            checkpoints=[Checkpoint(start_time=checkpoint, stats=TypeStats()) for checkpoint in checkpoints],
+        )
+        for model in [TextExam, DialogueExam]:
+            seen_content_ids: set[str] = set()
+            for exam in session.query(model).filter(
+                    get_filter(language, paired, modality, model),
+            ).order_by(model.started_at):
+                sentences_evaluated = len(cast(list, exam.results))
+                scores_total = sum(result.score for result in exam.results)
+                for period in [stats.all_time, *(checkpoint.stats for checkpoint in stats.checkpoints
+                                                 if checkpoint.start_time <= exam.started_at)]:
+                    for type_stats in [period.overall, period.text if model == TextExam else period.dialogue]:
+                        type_stats.time_spent += exam.duration
+                        type_stats.exams_taken += 1
+                        type_stats.sentences_evaluated += sentences_evaluated
+                        if exam.content_id not in seen_content_ids:
+                            type_stats.first_time_exams_taken += 1
+                            type_stats.first_time_sentences_evaluated += sentences_evaluated
+                            type_stats.fte_time_spent += exam.duration
+                            type_stats.fts_scores_total += scores_total
+                seen_content_ids.add(exam.content_id)
+        return stats
+
+
+def format_stats(stats: PeriodStats) -> list[str]:
+    """Format the statistics as they are displayed."""
+    return [
+        formatter(type_stats)
+        for period in [stats.all_time, *(checkpoint.stats for checkpoint in stats.checkpoints)]
+        for type_stats in [period.text, period.dialogue, period.overall]
+        for formatter in [
+            Stats.format_time_spent,
+            Stats.format_exams_taken,
+            Stats.format_sentences_evaluated,
+            Stats.format_first_time_exams_taken,
+            Stats.format_first_time_sentences_evaluated,
+            Stats.format_avg_fte_time_per_sentence,
+            Stats.format_avg_fts_score,
+        ]
+    ]
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--exams', type=int, default=100000)
+    parser.add_argument('--checkpoints', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    generate_database(rng, args.exams)
+    checkpoints = sorted(START + PERIOD * rng.random() for _ in range(args.checkpoints))
+    with single_session() as session:
+        language = session.get(Language, LANGUAGES[0])
+        paired = [session.get(Language, LANGUAGES[1])]
+
+    print(f'Exams: {args.exams}, checkpoints: {len(checkpoints)}')
+    print(f'{'Case':<36} {'Replay, s':>10} {'SQL, s':>10} {'Speedup':>8}')
+    cases = [[modality] for modality in Modality] + [list(Modality)]
+    for modalities in cases:
+        for pair in [None, paired]:
+            start = perf_counter()
+            expected = {modality: compute_stats_by_replay(language, pair, modality, checkpoints)
+                        for modality in modalities}
+            replay = perf_counter() - start
+            start = perf_counter()
+            stats = compute_stats(language, pair, modalities, checkpoints)
+            aggregated = perf_counter() - start
+            assert stats == expected and all(format_stats(stats[modality]) == format_stats(expected[modality])
+                                             for modality in modalities)
+            name = f'{' + '.join(modality.value for modality in modalities)}{'' if pair is None else ', paired'}'
+            print(f'{name:<36} {replay:10.2f} {aggregated:10.2f} {replay / aggregated:8.1f}')
+
+if __name__ == '__main__':
+    main()
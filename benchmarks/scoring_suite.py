@@ -0,0 +1,197 @@
+"""
+Benchmark suite of the offline scoring hot path on seeded synthetic corpora in several scripts and lengths.
+
+Usage:
+    python benchmarks/scoring_suite.py                    Run the suite and compare it with the baseline
+    python benchmarks/scoring_suite.py --save-baseline    Run the suite and store the results as the new baseline
+    python benchmarks/scoring_suite.py --filter tokenize  Run only the cases whose names contain the substring
+
+The baseline is not committed, as it depends on the machine: save one locally before making changes, then run
+the suite again to compare. Latencies are compared relative to a fixed reference operation measured alongside each
+case, so that the machine speeding up or slowing down between the two runs does not affect the comparison. A case
+exceeding the baseline by more than the tolerance is measured again, and the process exits with a non-zero status
+if the better of the two measurements still does. Fewer rounds or shorter time budgets make the comparison noisier.
+"""
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass
+import gc
+import json
+from pathlib import Path
+from random import Random
+from statistics import fmean, median, quantiles
+import sys
+from time import perf_counter
+from typing import Callable
+
+from corpus import generate_answer, generate_sentence, SCRIPTS
+
+from reling.app.commands.exam.scoring import finalize_scoring
+from reling.helpers.diff import highlight_diff
+from reling.helpers.fuzzy_word import FuzzyWord, get_similarity
+from reling.helpers.scoring import calculate_diff_score
+from reling.utils.strings import tokenize
+
+BASELINE = Path(__file__).parent / 'baseline.json'
+TOKEN_COUNTS = [5, 20, 50, 200]
+SENTENCES_PER_CASE = 8
+PERFECT_OPTIONS = 20
+DEFAULT_TOLERANCE = 0.3
+DEFAULT_MIN_ROUNDS = 3
+DEFAULT_MAX_SECONDS = 1.0
+REFERENCE_SIZE = 1000
+
+
+@dataclass
+class Result:
+    calls: int
+    ops_per_sec: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    relative_p50: float
+
+
+type Operation = Callable[[], object]
+
+
+def build_operations(rng: Random, script: str, tokens: int) -> dict[str, list[Operation]]:
+    """Build the operations measured for the script and sentence length, one per generated sentence."""
+    operations: dict[str, list[Operation]] = {
+        'tokenize': [],
+        'fuzzy_word_compare': [],
+        'calculate_diff_score': [],
+        'finalize_scoring': [],
+        'highlight_diff': [],
+    }
+    for _ in range(SENTENCES_PER_CASE):
+        sentence = generate_sentence(rng, script, tokens)
+        answer = generate_answer(rng, sentence, script)
+        perfect = {generate_answer(rng, sentence, script) for _ in range(PERFECT_OPTIONS)}
+        words = [FuzzyWord(word) for word in tokenize(sentence, punctuation=False, whitespace=False)]
+        answer_words = [FuzzyWord(word) for word in tokenize(answer, punctuation=False, whitespace=False)]
+
+        def compare_words(a: list[FuzzyWord] = words, b: list[FuzzyWord] = answer_words) -> None:
+            get_similarity.cache_clear()
+            for a_word, b_word in zip(a, b):
+                FuzzyWord.compare(a_word, b_word)
+
+        operations['tokenize'].append(lambda text=sentence: tokenize(text))
+        operations['fuzzy_word_compare'].append(compare_words)
+        operations['calculate_diff_score'].append(lambda a=answer, b=sentence: calculate_diff_score(a, b))
+        operations['finalize_scoring'].append(lambda a=answer, b=sentence, options=perfect: finalize_scoring(
+            a,
+            default_score=None,
+            default_suggestion=b,
+            perfect_options=options,
+        ))
+        operations['highlight_diff'].append(lambda a=answer, b=sentence: highlight_diff(a, b))
+    return operations
+
+
+def build_reference_operation(rng: Random) -> Operation:
+    """Build the pure-Python operation whose latency the latencies of the cases are divided by."""
+    data = [rng.random() for _ in range(REFERENCE_SIZE)]
+    return lambda: sorted(data)
+
+
+def time_call(operation: Operation) -> float:
+    """Return the time taken by a call of the operation."""
+    start = perf_counter()
+    operation()
+    return perf_counter() - start
+
+
+def measure(operations: list[Operation], reference: Operation, min_rounds: int, max_seconds: float) -> Result:
+    """
+    Call the operations in turn, once to warm up and then in at least `min_rounds` complete rounds and until the time
+    budget is exhausted, so that each operation is weighted equally. After each call, the reference
+    operation is called for about as long, and the latency of the call is divided by the best latency of these
+    reference calls, so that the relative latency is not affected by the machine speeding up or slowing down.
+    """
+    for operation in [*operations, reference]:
+        operation()
+    latencies: list[float] = []
+    relative_latencies: list[float] = []
+    gc.collect()
+    gc.disable()  # As timeit does, so that collections triggered by earlier cases do not add to the latencies
+    try:
+        started = perf_counter()
+        while (len(latencies) < min_rounds * len(operations) or perf_counter() - started < max_seconds
+               or len(latencies) % len(operations) != 0):
+            latencies.append(time_call(operations[len(latencies) % len(operations)]))
+            reference_latencies = [time_call(reference)]
+            while sum(reference_latencies) < latencies[-1]:
+                reference_latencies.append(time_call(reference))
+            relative_latencies.append(latencies[-1] / min(reference_latencies))
+    finally:
+        gc.enable()
+    cuts = quantiles(latencies, n=100, method='inclusive')
+    return Result(
+        calls=len(latencies),
+        ops_per_sec=len(latencies) / sum(latencies),
+        p50_ms=cuts[49] * 1000,
+        p90_ms=cuts[89] * 1000,
+        p99_ms=cuts[98] * 1000,
+        relative_p50=fmean(
+            median(relative_latencies[index::len(operations)]) for index in range(len(operations))
+        ),
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--filter', default='')
+    parser.add_argument('--min-rounds', type=int, default=DEFAULT_MIN_ROUNDS)
+    parser.add_argument('--max-seconds', type=float, default=DEFAULT_MAX_SECONDS)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    baseline: dict[str, dict[str, float]] = (
+        json.loads(args.baseline.read_text()) if args.baseline.exists() and not args.save_baseline else {}
+    )
+    results: dict[str, Result] = {}
+    regressions: list[str] = []
+    reference = build_reference_operation(Random(args.seed))
+
+    print(f'{'Case':<40} {'ops/s':>10} {'p50, ms':>10} {'p90, ms':>10} {'p99, ms':>10} {'vs baseline':>12}')
+    for script in SCRIPTS:
+        for tokens in TOKEN_COUNTS:
+            operations = build_operations(Random(f'{args.seed}/{script}/{tokens}'), script, tokens)
+            for function, function_operations in operations.items():
+                name = f'{function}/{script}/{tokens}'
+                if args.filter not in name:
+                    continue
+                result = results[name] = measure(function_operations, reference, args.min_rounds, args.max_seconds)
+                comparison = ''
+                if (previous := baseline.get(name)) is not None:
+                    ratio = result.relative_p50 / previous['relative_p50']
+                    if ratio > 1 + args.tolerance:  # Measure again to tell a regression from a transient slowdown
+                        retry = measure(function_operations, reference, args.min_rounds, args.max_seconds)
+                        if retry.relative_p50 < result.relative_p50:
+                            result = results[name] = retry
+                            ratio = result.relative_p50 / previous['relative_p50']
+                    comparison = f'{ratio:11.2f}x'
+                    if ratio > 1 + args.tolerance:
+                        regressions.append(name)
+                        comparison += '!'
+                print(f'{name:<40} {result.ops_per_sec:10.1f} {result.p50_ms:10.3f} {result.p90_ms:10.3f} '
+                      f'{result.p99_ms:10.3f} {comparison:>12}')
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(
+            {name: asdict(result) for name, result in results.items()},
+            indent=2,
+        ) + '\n')
+        print(f'Baseline saved to {args.baseline}.')
+    elif not baseline:
+        print(f'No baseline to compare with at {args.baseline}; save one with --save-baseline.')
+    elif regressions:
+        print(f'Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Throughput benchmark of `tokenize` on generated Latin, Cyrillic, and CJ texts.
+
+Usage: python benchmarks/tokenize.py [--repeat N] [--seed S]
+"""
+from argparse import ArgumentParser
+from random import Random
+from timeit import timeit
+
+from corpus import generate_sentence, SCRIPTS
+
+from reling.utils.strings import tokenize
+
+TEXT_TOKENS = 2000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    print(f'{'Script':>10} {'Characters':>12} {'Mchars/s':>10}')
+    for script in SCRIPTS:
+        text = generate_sentence(rng, script, TEXT_TOKENS)
+        seconds = timeit(
+            lambda: tokenize(text, punctuation=False, whitespace=False, cj=True),
+            number=args.repeat,
+        ) / args.repeat
+        print(f'{script:>10} {len(text):>12} {len(text) / seconds / 1e6:10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -15,7 +15,7 @@ __all__ = [
 
 APP_NAME = 'ReLing'
 
-LATEST_DB_VERSION = 'e'
+LATEST_DB_VERSION = 'g'
 OLDEST_DB_VERSION = 'a'
 DB_NAME = 'reling-{version}.db'
 
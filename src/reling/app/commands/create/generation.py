@@ -3,7 +3,7 @@ from typing import Generator
 
 from reling.db.enums import ContentCategory, Gender, Level
 from reling.db.models import Language
-from reling.gpt import GPTClient
+from reling.gpt import GptCallSite, GPTClient
 from reling.types import DialogueExchangeData, WordWithSense
 from reling.utils.english import pluralize
 from reling.utils.iterables import pair_items
@@ -75,6 +75,7 @@ def generate_text_sentences(
             *build_include_prompt(include),
         ]),
         transformers=[strip, omit_empty, remove_numbering],
+        call_site=GptCallSite.GENERATION,
     )
 
 
@@ -103,6 +104,7 @@ def generate_dialogue_exchanges(
             *build_include_prompt(include),
         ]),
         transformers=[strip, omit_empty, remove_numbering],
+        call_site=GptCallSite.GENERATION,
     ))))
 
 
@@ -120,4 +122,5 @@ def generate_id(
             'Do not include any additional text; only generate the English name as specified.',
         ]),
         transformers=[slugify],
+        call_site=GptCallSite.GENERATION,
     )) or [''])[0]
@@ -6,6 +6,7 @@ from reling.app.types import (
     EXAM_CONTENT_ARG,
     ExamExtraContentOptions,
     HIDE_PROMPTS_OPT,
+    INCREMENTAL_SCORING_OPT,
     LANGUAGE_OPT,
     LANGUAGE_OPT_FROM,
     LISTEN_OPT,
@@ -19,7 +20,7 @@ from reling.app.types import (
 )
 from reling.asr import ASRClient
 from reling.db.models import Dialogue, Language, Text
-from reling.gpt import GPTClient
+from reling.gpt import GPTClient, ResponseCache
 from reling.helpers.audio import ensure_audio
 from reling.helpers.typer import typer_raise
 from reling.scanner import ScannerManager, ScannerParams
@@ -105,12 +106,16 @@ def exam(
         scan: SCAN_OPT = None,
         hide_prompts: HIDE_PROMPTS_OPT = False,
         offline_scoring: OFFLINE_SCORING_OPT = False,
+        incremental_scoring: INCREMENTAL_SCORING_OPT = False,
         retry: RETRY_OPT = False,
 ) -> None:
     """
     Test the user's ability to translate content from one language to another.
     If only one language is specified, the content's original language is assumed for the unspecified direction.
     """
+    if offline_scoring and incremental_scoring:
+        typer_raise('Choose either offline or incremental scoring, not both.')
+
     params, repetition_data = adjust_exam_params(content, from_, to, skip, read, listen, scan)
 
     if repetition_data:
@@ -132,8 +137,10 @@ def exam(
     if len(skipped_indices) == content.size:
         typer_raise('All sentences are skipped, exiting.', is_error=False)
 
+    cache = ResponseCache()
+
     def get_gpt() -> GPTClient:
-        return GPTClient(api_key=api_key.get(), model=model.get())
+        return GPTClient(api_key=api_key.get(), model=model.get(), cache=cache)
 
     perform_exam(
         get_gpt,
@@ -152,5 +159,6 @@ def exam(
         ) if scan is not None else None),
         hide_prompts=hide_prompts,
         offline_scoring=offline_scoring,
+        incremental_scoring=incremental_scoring,
         retry=retry,
     )
@@ -6,8 +6,9 @@ from reling.app.exceptions import AlgorithmException
 from reling.app.translation import get_dialogue_exchanges, get_text_sentences
 from reling.asr import ASRClient
 from reling.config import MAX_SCORE
+from reling.db import single_session
 from reling.db.enums import ContentCategory, Gender
-from reling.db.models import Dialogue, DialogueExam, Language, Text, TextExam
+from reling.db.models import Dialogue, DialoguePerfectAnswer, Language, Text, TextPerfectAnswer
 from reling.gpt import GPTClient
 from reling.helpers.typer import typer_raise
 from reling.helpers.voices import pick_voices
@@ -16,9 +17,10 @@ from reling.tts import TTSClient, TTSVoiceClient
 from reling.types import DialogueExchangeData, Promise
 from reling.utils.timetracker import TimeTracker
 from .explanation import build_explainer
+from .grades import GradedAnswers
 from .input import collect_translations
 from .presentation import present_results
-from .scoring import score_translations
+from .scoring import IncrementalScorer, score_translations
 from .storage import save_exam
 from .types import ExchangeWithTranslation, ScoreWithSuggestion, SentenceWithTranslation
 
@@ -32,13 +34,13 @@ def collect_perfect(content: Text | Dialogue, target_language: Language) -> list
     Collect the suggestions and correct answers from previous exams in the same target language, indexed by sentence.
     """
     suggestions = [set() for _ in range(content.size)]
-    for exam in cast(list[TextExam] | list[DialogueExam], content.exams):
-        if exam.target_language == target_language:
-            for result in exam.results:
-                if result.suggested_answer:
-                    suggestions[result.index].add(result.suggested_answer)
-                if result.score == MAX_SCORE:
-                    suggestions[result.index].add(result.answer)
+    with single_session() as session:
+        for perfect in (
+            session.query(TextPerfectAnswer).filter_by(text_id=content.id)
+            if isinstance(content, Text)
+            else session.query(DialoguePerfectAnswer).filter_by(dialogue_id=content.id)
+        ).filter_by(target_language_id=target_language.id):
+            suggestions[perfect.index].add(perfect.answer)
     return suggestions
 
 
@@ -85,6 +87,7 @@ def perform_exam_round(
         scanner_manager: ScannerManager,
         hide_prompts: bool,
         offline_scoring: bool,
+        incremental_scoring: bool,
         previous_attempts: list[list[SentenceWithTranslation | ExchangeWithTranslation]],
         previous_scores: list[list[ScoreWithSuggestion]],
         storage: Path,
@@ -94,11 +97,28 @@ def perform_exam_round(
     list[ScoreWithSuggestion | None],
     Scanner | None,
 ]:
-    """Collect user translations of the text or dialogue, score them, and return the results, all in a single round."""
+    """
+    Collect user translations of the text or dialogue, score them, and return the results, all in a single round.
+    With incremental scoring, each translation is scored in the background as soon as it is provided.
+    """
+    category = ContentCategory.TEXT if isinstance(content, Text) else ContentCategory.DIALOGUE
+    previous_perfect = collect_perfect(content, target_language)
+    graded_answers = GradedAnswers(content, target_language) if not offline_scoring else None
+    scorer = IncrementalScorer(
+        category=category,
+        gpt=gpt,
+        original_translations=original_translations,
+        previous_perfect=previous_perfect,
+        source_language=source_language,
+        target_language=target_language,
+        graded_answers=graded_answers,
+    ) if incremental_scoring and not offline_scoring else None
+
     with scanner_manager.get_scanner() as scanner:
         tracker.resume()
-        translated = list(collect_translations(
-            category=ContentCategory.TEXT if isinstance(content, Text) else ContentCategory.DIALOGUE,
+        translated: list[SentenceWithTranslation | ExchangeWithTranslation] = []
+        for item in collect_translations(
+            category=category,
             items=items,
             original_translations=original_translations,
             skipped_indices=skipped_indices,
@@ -113,19 +133,23 @@ def perform_exam_round(
             storage=storage,
             on_pause=tracker.pause,
             on_resume=tracker.resume,
-        ))
+        ):
+            translated.append(item)
+            if scorer:
+                scorer.add(item)
         tracker.pause()
 
     try:
-        results = list(score_translations(
-            category=ContentCategory.TEXT if isinstance(content, Text) else ContentCategory.DIALOGUE,
+        results = list(scorer.score() if scorer else score_translations(
+            category=category,
             gpt=gpt,
             items=translated,
             original_translations=original_translations,
-            previous_perfect=collect_perfect(content, target_language),
+            previous_perfect=previous_perfect,
             source_language=source_language,
             target_language=target_language,
             offline=offline_scoring,
+            graded_answers=graded_answers,
         ))
     except AlgorithmException as e:
         typer_raise(e.msg)
@@ -145,6 +169,7 @@ def perform_exam(
         scanner_manager: ScannerManager,
         hide_prompts: bool,
         offline_scoring: bool,
+        incremental_scoring: bool,
         retry: bool,
 ) -> None:
     """
@@ -185,6 +210,7 @@ def perform_exam(
                 scanner_manager=scanner_manager,
                 hide_prompts=hide_prompts,
                 offline_scoring=offline_scoring,
+                incremental_scoring=incremental_scoring,
                 previous_attempts=previous_attempts,
                 previous_scores=previous_scores,
                 storage=Path(file_storage),
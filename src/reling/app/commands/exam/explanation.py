@@ -3,7 +3,7 @@ from typing import Callable, Generator
 from reling.config import MAX_SCORE
 from reling.db.enums import ContentCategory
 from reling.db.models import Language
-from reling.gpt import GPTClient
+from reling.gpt import GptCallSite, GPTClient
 from reling.types import DialogueExchangeData, Promise
 from reling.utils.feeders import CharFeeder
 from reling.utils.values import coalesce
@@ -119,6 +119,7 @@ def do_explain(
         creative=False,
         feeder_type=CharFeeder,
         auto_normalize=False,
+        call_site=GptCallSite.EXPLANATION,
     )
 
 
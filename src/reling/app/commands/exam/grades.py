@@ -0,0 +1,58 @@
+from reling.db import single_session
+from reling.db.models import Dialogue, DialogueGradedAnswer, Language, Text, TextGradedAnswer
+from reling.utils.time import now
+from .types import PreScoreWithSuggestion
+
+__all__ = [
+    'GradedAnswers',
+]
+
+
+def normalize_answer(answer: str) -> str:
+    """Normalize the answer for the purpose of matching it with previously graded answers."""
+    return ' '.join(answer.split())
+
+
+class GradedAnswers:
+    """
+    Scores and suggestions given by the model to the previous answers to the sentences of a text or dialogue
+    in a specific target language, to be reused when the same answer is given again.
+    """
+
+    _content: Text | Dialogue
+    _target_language: Language
+    _grades: dict[tuple[int, str], PreScoreWithSuggestion]
+
+    def __init__(self, content: Text | Dialogue, target_language: Language) -> None:
+        self._content = content
+        self._target_language = target_language
+        with single_session() as session:
+            query = (
+                session.query(TextGradedAnswer).filter_by(text_id=content.id)
+                if isinstance(content, Text)
+                else session.query(DialogueGradedAnswer).filter_by(dialogue_id=content.id)
+            )
+            self._grades = {
+                (graded.index, graded.answer): PreScoreWithSuggestion(graded.score, graded.suggested_answer)
+                for graded in query.filter_by(target_language_id=target_language.id)
+            }
+
+    def get(self, index: int, answer: str) -> PreScoreWithSuggestion | None:
+        """Return the grade of the same answer to the sentence or exchange with the given index, if any."""
+        return self._grades.get((index, normalize_answer(answer)))
+
+    def put(self, index: int, answer: str, grade: PreScoreWithSuggestion) -> None:
+        """Store the grade of the answer to the sentence or exchange with the given index."""
+        normalized = normalize_answer(answer)
+        self._grades[(index, normalized)] = grade
+        with single_session() as session:
+            session.merge((TextGradedAnswer if isinstance(self._content, Text) else DialogueGradedAnswer)(
+                content_id=self._content.id,
+                index=index,
+                target_language_id=self._target_language.id,
+                answer=normalized,
+                score=grade.score,
+                suggested_answer=grade.suggestion,
+                graded_at=now(),
+            ))
+            session.commit()
@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Callable, Generator
 
 from lcs2 import lcs_indices
 from tqdm import tqdm
@@ -7,21 +7,25 @@ from reling.app.exceptions import AlgorithmException
 from reling.config import MAX_SCORE
 from reling.db.enums import ContentCategory
 from reling.db.models import Language
-from reling.gpt import GPTClient
-from reling.helpers.scoring import calculate_diff_score
+from reling.gpt import AsyncGPTClient, GptCallSite, GPTClient
+from reling.helpers.scoring import ScoringContext
 from reling.types import DialogueExchangeData, Promise
 from reling.utils.english import pluralize
 from reling.utils.iterables import extract_items, group_items, intersperse, strict_zip
 from reling.utils.transformers import add_numbering, apply, get_number, omit_empty, remove_numbering, strip
-from reling.utils.values import wrap_in_list
+from reling.utils.values import coalesce, wrap_in_list
+from .grades import GradedAnswers
 from .types import ExchangeWithTranslation, PreScoreWithSuggestion, ScoreWithSuggestion, SentenceWithTranslation
 
 __all__ = [
+    'IncrementalScorer',
     'score_translations',
 ]
 
 NA = 'N/A'
 
+INCREMENTAL_CONTEXT_SIZE = 3  # Number of preceding sentences or exchanges sent along with each incremental request
+
 
 def build_prompt_translation(
         category: ContentCategory,
@@ -92,6 +96,7 @@ def ask_and_parse_translation(gpt: GPTClient, prompt: str) -> Generator[PreScore
         prompt,
         creative=False,
         transformers=[strip, omit_empty, remove_numbering],
+        call_site=GptCallSite.SCORING,
     ), 5):
         yield parse_scoring(string_score, suggestion)
 
@@ -121,18 +126,38 @@ def build_prompt_averaging(language: Language, sentence: str, a: str, b: str) ->
     ])
 
 
-def ask_and_parse_averaging(gpt: GPTClient, prompt: str) -> PreScoreWithSuggestion:
+def submit_and_parse(
+        gpt: AsyncGPTClient,
+        prompt: str,
+        group_size: int,
+        call_site: GptCallSite,
+) -> Promise[PreScoreWithSuggestion]:
     """
-    Ask the model to score an "averaged" translation and parse the output.
-    :raises AlgorithmException: If there is an issue with the output of the model.
+    Ask the model in the background for feedback whose last two lines of the first `group_size` are the score
+    and the suggestion, and return a promise of the parsed output.
+    :raises AlgorithmException: If there is an issue with the output of the model (when the promise is resolved).
     """
-    for string_score, suggestion in group_items(gpt.ask(
-            prompt,
-            creative=False,
-            transformers=[strip, omit_empty, remove_numbering],
-    ), 2):
-        return parse_scoring(string_score, suggestion)
-    raise AlgorithmException('The model did not provide a response.')
+    response = gpt.submit(
+        prompt,
+        creative=False,
+        transformers=[strip, omit_empty, remove_numbering],
+        call_site=call_site,
+    )
+
+    def parse() -> PreScoreWithSuggestion:
+        for *_, string_score, suggestion in group_items(response(), group_size):
+            return parse_scoring(string_score, suggestion)
+        raise AlgorithmException('The model did not provide a response.')
+
+    return parse
+
+
+def ask_and_parse_averaging(gpt: AsyncGPTClient, prompt: str) -> Promise[PreScoreWithSuggestion]:
+    """
+    Ask the model to score an "averaged" translation in the background and return a promise of the parsed output.
+    :raises AlgorithmException: If there is an issue with the output of the model (when the promise is resolved).
+    """
+    return submit_and_parse(gpt, prompt, group_size=2, call_site=GptCallSite.AVERAGING)
 
 
 def lcs_indices_a(a: str, b: str) -> set[int | tuple[int, int]]:
@@ -167,12 +192,11 @@ def finalize_scoring(
         return ScoreWithSuggestion(0, None)
 
     options = wrap_in_list(default_suggestion) + sorted(perfect_options - set(wrap_in_list(default_suggestion)))
-    option_scores = [calculate_diff_score(provided_translation, option) for option in options]
-    best_option_index = option_scores.index(max(option_scores)) if option_scores else None
+    best = ScoringContext(provided_translation).find_best(options, min_score=coalesce(default_score, 0))
 
     score, suggestion = (
-        (option_scores[best_option_index], options[best_option_index])
-        if option_scores and (default_score is None or option_scores[best_option_index] >= default_score)
+        (best[1], options[best[0]])
+        if best is not None
         else (default_score, default_suggestion)
     )
 
@@ -183,35 +207,45 @@ def finalize_scoring(
 
 
 def fix_scoring(
-        gpt: GPTClient,
+        gpt: AsyncGPTClient,
         language: Language,
         provided_translation: str,
         original_translation: str,
         perfect_options: set[str],
         score: PreScoreWithSuggestion,
-) -> ScoreWithSuggestion:
+        on_fixed: Callable[[PreScoreWithSuggestion], None] | None = None,
+) -> Promise[ScoreWithSuggestion]:
     """
     Fix the scoring by comparing the provided translation with the original translation and the suggested translation,
-    as well as the perfect options, and returning the best score and suggestion.
+    as well as the perfect options, and return a promise of the best score and suggestion.
+    The "averaging" request, if one is needed, is sent in the background right away;
+    `on_fixed` receives the model's fixed score before it is compared with the perfect options.
     """
-    default = (
-        score if (score.suggestion is None
-                  # If the provided translation shares as much or more common characters (individual indices)
-                  # and omissions (pairs of consecutive indices) with the suggestion as with the original translation,
-                  # proceed with the current score; otherwise, recalculate the score using "averaging":
-                  or lcs_indices_a(provided_translation, score.suggestion)
-                  >= lcs_indices_a(provided_translation, original_translation))
-        else ask_and_parse_averaging(
+    if (score.suggestion is None
+            # If the provided translation shares as much or more common characters (individual indices)
+            # and omissions (pairs of consecutive indices) with the suggestion as with the original translation,
+            # proceed with the current score; otherwise, recalculate the score using "averaging":
+            or lcs_indices_a(provided_translation, score.suggestion)
+            >= lcs_indices_a(provided_translation, original_translation)):
+        default: Promise[PreScoreWithSuggestion] = lambda: score
+    else:
+        default = ask_and_parse_averaging(
             gpt,
             build_prompt_averaging(language, provided_translation, a=original_translation, b=score.suggestion),
         )
-    )
-    return finalize_scoring(
-        provided_translation,
-        default.score,
-        default.suggestion,
-        perfect_options,
-    )
+
+    def finalize() -> ScoreWithSuggestion:
+        resolved = default()
+        if on_fixed:
+            on_fixed(resolved)
+        return finalize_scoring(
+            provided_translation,
+            resolved.score,
+            resolved.suggestion,
+            perfect_options,
+        )
+
+    return finalize
 
 
 def extract_translation(translation: str | DialogueExchangeData) -> str:
@@ -224,6 +258,39 @@ def map_to_null_if_not[T](condition: bool, items: list[T]) -> list[T | None]:
     return [item if condition else None for item in items]
 
 
+def requires_gpt(
+        item: SentenceWithTranslation | ExchangeWithTranslation,
+        original_translation: str | DialogueExchangeData,
+        perfect: set[str],
+) -> bool:
+    """Check whether the translation is non-empty and differs from the original translation and the perfect options."""
+    return (item.input is not None and item.input.text != ''
+            and item.input.text not in {extract_translation(original_translation)} | perfect)
+
+
+def get_trivial_score(item: SentenceWithTranslation | ExchangeWithTranslation) -> ScoreWithSuggestion | None:
+    """Score a translation that does not require the model: untranslated, empty, or known to be perfect."""
+    return ScoreWithSuggestion(MAX_SCORE if item.input.text else 0, None) if item.input else None
+
+
+def reuse_grade(
+        item: SentenceWithTranslation | ExchangeWithTranslation,
+        perfect: set[str],
+        grade: PreScoreWithSuggestion,
+) -> Promise[ScoreWithSuggestion]:
+    """Score a translation using the grade previously given by the model to the same answer."""
+    return lambda: finalize_scoring(item.input.text, grade.score, grade.suggestion, perfect)
+
+
+def store_grade(
+        graded_answers: GradedAnswers | None,
+        index: int,
+        item: SentenceWithTranslation | ExchangeWithTranslation,
+) -> Callable[[PreScoreWithSuggestion], None] | None:
+    """Return a function storing the model's grade of the translation for reuse, if the grades are tracked."""
+    return (lambda grade: graded_answers.put(index, item.input.text, grade)) if graded_answers else None
+
+
 def score_offline(
         items: list[SentenceWithTranslation] | list[ExchangeWithTranslation],
         original_translations: list[str] | list[DialogueExchangeData],
@@ -247,20 +314,21 @@ def score_with_gpt(
         previous_perfect: list[set[str]],
         source_language: Language,
         target_language: Language,
+        graded_answers: GradedAnswers | None = None,
 ) -> Generator[ScoreWithSuggestion | None, None, None]:
     """
     Score the translations of a text or user turns in a dialogue with the help of a GPT model.
+    Answers graded by the model before are not sent to it again.
     :raises AlgorithmException: If there is an issue with the output of the model.
     """
-    translated_indices_set = {index for index in range(len(items)) if items[index].input}
-    empty_translation_indices_set = {
-        index for index in range(len(items))
-        if index in translated_indices_set and not items[index].input.text
+    grades = {
+        index: grade for index in range(len(items))
+        if requires_gpt(items[index], original_translations[index], previous_perfect[index])
+        and graded_answers and (grade := graded_answers.get(index, items[index].input.text))
     }
     indices = [
         index for index in range(len(items))
-        if index in translated_indices_set and index not in empty_translation_indices_set
-        and items[index].input.text not in {extract_translation(original_translations[index])} | previous_perfect[index]
+        if requires_gpt(items[index], original_translations[index], previous_perfect[index]) and index not in grades
     ]
     indices_set = set(indices)
     client, prompt = (gpt(), build_prompt_translation(
@@ -276,6 +344,10 @@ def score_with_gpt(
         tuple[ExchangeWithTranslation, DialogueExchangeData, set[str], PreScoreWithSuggestion] |
         None
     ] = [None] * (len(items) - len(indices))
+    # The scoring stream is consumed in full first so that the "averaging" requests run concurrently with it;
+    # the results are then yielded in order as they are resolved
+    async_client = client.to_async() if client else None
+    results: list[Promise[ScoreWithSuggestion | None]] = []
     for index, data in enumerate(intersperse(outer, zip(strict_zip(
             AlgorithmException('The model returned an unexpected number of results.'),
             extract_items(items, indices),
@@ -289,19 +361,132 @@ def score_with_gpt(
             ) if client and prompt else [],
     ), indices))):
         if data is None:
-            yield (ScoreWithSuggestion(0 if index in empty_translation_indices_set else MAX_SCORE, None)
-                   if index in translated_indices_set else None)
+            if index in grades:
+                results.append(reuse_grade(items[index], previous_perfect[index], grades[index]))
+            else:
+                result = get_trivial_score(items[index])
+                results.append(lambda result=result: result)
         else:
             item, original_translation, perfect, pre_score = data
-            assert client is not None
-            yield fix_scoring(
-                client,
+            assert async_client is not None
+            results.append(fix_scoring(
+                async_client,
                 target_language,
                 item.input.text,
                 extract_translation(original_translation),
                 perfect,
                 pre_score,
-            )
+                on_fixed=store_grade(graded_answers, index, item),
+            ))
+    for result in results:
+        yield result()
+
+
+class IncrementalScorer:
+    """
+    Scorer of the translations of a text or user turns in a dialogue that sends a scoring request for each translation
+    in the background as soon as it is provided, with the preceding sentences or exchanges as context.
+    """
+
+    _category: ContentCategory
+    _gpt: Promise[GPTClient]
+    _client: AsyncGPTClient | None
+    _original_translations: list[str] | list[DialogueExchangeData]
+    _previous_perfect: list[set[str]]
+    _source_language: Language
+    _target_language: Language
+    _graded_answers: GradedAnswers | None
+    _items: list[SentenceWithTranslation | ExchangeWithTranslation]
+    _pre_scores: list[Promise[PreScoreWithSuggestion] | None]
+    _reused: set[int]
+
+    def __init__(
+            self,
+            category: ContentCategory,
+            gpt: Promise[GPTClient],
+            original_translations: list[str] | list[DialogueExchangeData],
+            previous_perfect: list[set[str]],
+            source_language: Language,
+            target_language: Language,
+            graded_answers: GradedAnswers | None = None,
+    ) -> None:
+        self._category = category
+        self._gpt = gpt
+        self._client = None
+        self._original_translations = original_translations
+        self._previous_perfect = previous_perfect
+        self._source_language = source_language
+        self._target_language = target_language
+        self._graded_answers = graded_answers
+        self._items = []
+        self._pre_scores = []
+        self._reused = set()
+
+    def _get_client(self) -> AsyncGPTClient:
+        """Return the asynchronous client, creating it on the first request."""
+        if self._client is None:
+            self._client = self._gpt().to_async()
+        return self._client
+
+    def add(self, item: SentenceWithTranslation | ExchangeWithTranslation) -> None:
+        """
+        Add the next sentence or exchange, sending a scoring request for its translation if necessary
+        (unless the same answer has been graded before).
+        """
+        index = len(self._items)
+        self._items.append(item)
+        if not requires_gpt(item, self._original_translations[index], self._previous_perfect[index]):
+            self._pre_scores.append(None)
+        elif self._graded_answers and (grade := self._graded_answers.get(index, item.input.text)):
+            self._pre_scores.append(lambda: grade)
+            self._reused.add(index)
+        else:
+            context = self._items[max(index - INCREMENTAL_CONTEXT_SIZE, 0):index]
+            self._pre_scores.append(submit_and_parse(
+                self._get_client(),
+                build_prompt_translation(
+                    category=self._category,
+                    source_language=self._source_language,
+                    target_language=self._target_language,
+                    blocks=[block for scored_item in [*context, item] for block in scored_item.all()],
+                    translations=[
+                        *(None for context_item in context for _ in context_item.all()),
+                        *item.input_within_all(),
+                    ],
+                ),
+                group_size=5,
+                call_site=GptCallSite.SCORING,
+            ))
+
+    def score(self) -> Generator[ScoreWithSuggestion | None, None, None]:
+        """
+        Yield the scores of the added translations in order, waiting for the pending requests to complete.
+        :raises AlgorithmException: If there is an issue with the output of the model.
+        """
+        results: list[Promise[ScoreWithSuggestion | None]] = []
+        for index, (item, original_translation, perfect, pre_score) in enumerate(zip(
+                self._items,
+                self._original_translations,
+                self._previous_perfect,
+                self._pre_scores,
+        )):
+            if pre_score is None:
+                result = get_trivial_score(item)
+                results.append(lambda result=result: result)
+            elif index in self._reused:
+                results.append(reuse_grade(item, perfect, pre_score()))
+            else:
+                results.append(fix_scoring(
+                    self._get_client(),
+                    self._target_language,
+                    item.input.text,
+                    extract_translation(original_translation),
+                    perfect,
+                    pre_score(),
+                    on_fixed=store_grade(self._graded_answers, index, item),
+                ))
+        for result in results:
+            yield result()
 
 
 def score_translations(
@@ -313,6 +498,7 @@ def score_translations(
         source_language: Language,
         target_language: Language,
         offline: bool,
+        graded_answers: GradedAnswers | None = None,
 ) -> Generator[ScoreWithSuggestion | None, None, None]:
     """
     Score the translations of a text or user turns in a dialogue and provide suggestions for improvement.
@@ -334,4 +520,5 @@ def score_translations(
             previous_perfect=previous_perfect,
             source_language=source_language,
             target_language=target_language,
+            graded_answers=graded_answers,
         )
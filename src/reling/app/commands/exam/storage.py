@@ -1,7 +1,18 @@
 from datetime import datetime, timedelta
 
+from reling.config import MAX_SCORE
 from reling.db import single_session
-from reling.db.models import Dialogue, DialogueExam, DialogueExamResult, Language, Text, TextExam, TextExamResult
+from reling.db.models import (
+    Dialogue,
+    DialogueExam,
+    DialogueExamResult,
+    DialoguePerfectAnswer,
+    Language,
+    Text,
+    TextExam,
+    TextExamResult,
+    TextPerfectAnswer,
+)
 from reling.utils.ids import generate_id
 from .types import ExchangeWithTranslation, ScoreWithSuggestion, SentenceWithTranslation
 
@@ -10,6 +21,21 @@ __all__ = [
 ]
 
 
+def get_perfect_answers(
+        items: list[SentenceWithTranslation | ExchangeWithTranslation],
+        results: list[ScoreWithSuggestion | None],
+) -> set[tuple[int, str]]:
+    """Return the suggestions and perfectly scored answers of the exam, paired with the indices of the sentences."""
+    perfect: set[tuple[int, str]] = set()
+    for index, (item, result) in enumerate(zip(items, results)):
+        if result is not None:
+            if result.suggestion:
+                perfect.add((index, result.suggestion))
+            if result.score == MAX_SCORE:
+                perfect.add((index, item.input.text))
+    return perfect
+
+
 def save_exam(
         content: Text | Dialogue,
         source_language: Language,
@@ -24,7 +50,7 @@ def save_exam(
         items: list[SentenceWithTranslation | ExchangeWithTranslation],
         results: list[ScoreWithSuggestion | None],
 ) -> TextExam | DialogueExam:
-    """Save the results of a text or dialogue exam."""
+    """Save the results of a text or dialogue exam, adding the new perfect answers to the index."""
     is_text = isinstance(content, Text)
     with single_session() as session:
         exam = (TextExam if is_text else DialogueExam)(
@@ -50,5 +76,12 @@ def save_exam(
                     suggested_answer=result.suggestion,
                     score=result.score,
                 ))
+        for index, answer in get_perfect_answers(items, results):
+            session.merge((TextPerfectAnswer if is_text else DialoguePerfectAnswer)(
+                content_id=content.id,
+                index=index,
+                target_language_id=target_language.id,
+                answer=answer,
+            ))
         session.commit()
         return exam
@@ -1,5 +1,9 @@
+from math import ceil
+
 from reling.app.app import app
-from reling.gpt_log import get_log
+from reling.app.types import SUMMARY_OPT
+from reling.gpt_log import get_log, GptLogItem
+from reling.utils.tables import build_table, print_table
 
 __all__ = [
     'gpt_log',
@@ -7,13 +11,71 @@ __all__ = [
 
 ITEM_DIVIDER = '-' * 10
 
+UNKNOWN_CALL_SITE = 'other'
+PERCENTILES = [50, 90, 100]
+
+CALL_SITE_COLUMN = 'Call site'
+REQUESTS_COLUMN = 'Requests'
+CACHED_COLUMN = 'Cached'
+FIRST_TOKEN_COLUMN = 'First token, s (p50 / p90 / max)'
+TOTAL_COLUMN = 'Total, s (p50 / p90 / max)'
+
+
+def get_percentile(values: list[float], percentile: int) -> float:
+    """Return the nearest-rank percentile of the non-empty list of values."""
+    ordered = sorted(values)
+    return ordered[max(ceil(len(ordered) * percentile / 100), 1) - 1]
+
+
+def format_percentiles(values: list[float]) -> str:
+    return ' / '.join(f'{get_percentile(values, percentile):.2f}' for percentile in PERCENTILES) if values else '-'
+
+
+def display_summary(items: list[GptLogItem]) -> None:
+    """Display the number of requests and the distribution of their timings for each call site."""
+    groups: dict[str, list[GptLogItem]] = {}
+    for item in items:
+        groups.setdefault(item.call_site or UNKNOWN_CALL_SITE, []).append(item)
+    print_table(build_table(
+        headers=[CALL_SITE_COLUMN, REQUESTS_COLUMN, CACHED_COLUMN, FIRST_TOKEN_COLUMN, TOTAL_COLUMN],
+        data=(
+            {
+                CALL_SITE_COLUMN: call_site,
+                REQUESTS_COLUMN: str(len(group)),
+                CACHED_COLUMN: str(sum(item.cached for item in group)),
+                FIRST_TOKEN_COLUMN: format_percentiles([
+                    item.timing.first_token
+                    for item in group
+                    if item.timing and item.timing.first_token is not None
+                ]),
+                TOTAL_COLUMN: format_percentiles([item.timing.total for item in group if item.timing]),
+            }
+            for call_site, group in groups.items()
+        ),
+        justify={
+            REQUESTS_COLUMN: 'right',
+            CACHED_COLUMN: 'right',
+            FIRST_TOKEN_COLUMN: 'right',
+            TOTAL_COLUMN: 'right',
+        },
+    ))
+
 
 @app.command(hidden=True)
-def gpt_log() -> None:
+def gpt_log(summary: SUMMARY_OPT = False) -> None:
     """Display the GPT log from the last application run."""
-    for item_index, item in enumerate(get_log()):
+    items = get_log()
+    if summary:
+        display_summary(items)
+        return
+    for item_index, item in enumerate(items):
         if item_index > 0:
             print(ITEM_DIVIDER + '\n')
+        if item.call_site:
+            print(f'Call site:\n{item.call_site}\n')
         print(f'Prompt:\n"""\n{item.prompt}\n"""\n')
         print(f'Temperature:\n{item.temperature}\n')
-        print(f'Response:\n"""\n{item.response}\n"""\n')
+        if item.timing:
+            first_token = f'{item.timing.first_token:.2f} s' if item.timing.first_token is not None else '-'
+            print(f'Timing:\nfirst token {first_token}, total {item.timing.total:.2f} s\n')
+        print(f'Response{' (cached)' if item.cached else ''}:\n"""\n{item.response}\n"""\n')
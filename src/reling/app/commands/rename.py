@@ -4,7 +4,7 @@ from reling.app.app import app
 from reling.app.default_content import set_default_content
 from reling.app.types import CONTENT_ARG, NEW_ID_ARG
 from reling.db import single_session
-from reling.db.models import IdIndex
+from reling.db.models import GrammarStatsFirstSeen, IdIndex
 from reling.helpers.typer import typer_raise
 
 __all__ = [
@@ -25,6 +25,8 @@ def rename(content: CONTENT_ARG, new_id: NEW_ID_ARG) -> None:
         id_index_item.id = new_id
         content.id = new_id
         try:
+            session.flush()
+            session.query(GrammarStatsFirstSeen).filter_by(content_id=old_id).update({'content_id': new_id})
             session.commit()
             set_default_content(content)
             print(f'Renamed "{old_id}" to "{new_id}".')
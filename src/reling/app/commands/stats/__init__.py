@@ -1,3 +1,5 @@
+from functools import partial
+
 from reling.app.app import app
 from reling.app.types import (
     CHECKPOINT_OPT,
@@ -6,7 +8,9 @@ from reling.app.types import (
     LANGUAGE_ARG,
     PAIR_LANGUAGE_OPT,
     PRODUCTION_OPT,
+    WORKERS_OPT,
 )
+from reling.helpers.typer import typer_raise
 from reling.utils.time import local_to_utc
 from .grammar_stats import display_stats as display_grammar_stats
 from .modalities import Modality
@@ -25,15 +29,15 @@ def stats(
         comprehension: COMPREHENSION_OPT = False,
         production: PRODUCTION_OPT = False,
         checkpoint: CHECKPOINT_OPT = None,
+        workers: WORKERS_OPT = 1,
 ) -> None:
     """Show learning statistics for a specific language."""
+    if workers > 1 and not grammar:
+        typer_raise('Multiple workers can only be used with grammar statistics.')
     comprehension, production = comprehension or not production, production or not comprehension
-    display_stats = display_grammar_stats if grammar else display_regular_stats
-    checkpoint_dates = list(map(local_to_utc, checkpoint or []))
-    for (modality, should_display) in [
+    display_stats = partial(display_grammar_stats, workers=workers) if grammar else display_regular_stats
+    modalities = [modality for modality, should_display in [
         (Modality.COMPREHENSION, comprehension),
         (Modality.PRODUCTION, production),
-    ]:
-        if should_display:
-            print()
-            display_stats(language, pair, modality, checkpoint_dates)
+    ] if should_display]
+    display_stats(language, pair, modalities, list(map(local_to_utc, checkpoint or [])))
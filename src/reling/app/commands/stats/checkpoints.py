@@ -1,4 +1,6 @@
+from bisect import bisect_right
 from datetime import datetime
+from typing import Callable
 
 from rich.text import Text
 
@@ -7,6 +9,8 @@ from reling.utils.time import format_time
 
 __all__ = [
     'colorize',
+    'get_bucket',
+    'get_suffix_sums',
     'since',
 ]
 
@@ -22,3 +26,19 @@ def since(checkpoint: datetime) -> str:
 def colorize(text: str) -> Text:
     """Colorize the given checkpoint text for display."""
     return fade(text)
+
+
+def get_bucket(windows: list[datetime], time: datetime) -> int:
+    """
+    Return the bucket of the given time among the sorted distinct checkpoints, i.e., the number of checkpoints
+    not after it. The checkpoint with the given start time includes the buckets from its own bucket onwards.
+    """
+    return bisect_right(windows, time)
+
+
+def get_suffix_sums[T](buckets: list[T], add: Callable[[T, T], T]) -> list[T]:
+    """Return the sums of the buckets from each bucket onwards."""
+    sums = [buckets[-1]]
+    for bucket in reversed(buckets[:-1]):
+        sums.append(add(bucket, sums[-1]))
+    return sums[::-1]
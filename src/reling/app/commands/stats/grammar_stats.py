@@ -2,19 +2,21 @@ from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 from heapq import merge
+from itertools import batched
+from math import ceil
 from typing import cast
 
 from rich.text import Text
+from sqlalchemy import and_, ColumnElement, func, insert, or_, Select, select
 
 from reling.app.translation import get_dialogue_exchanges, get_text_sentences
 from reling.config import MAX_SCORE
-from reling.db import single_session
-from reling.db.models import DialogueExam, Language, TextExam
-from reling.helpers.grammar import Analyzer, WordInfo
-from reling.utils.console import print_and_erase
+from reling.db import Session, single_session
+from reling.db.models import DialogueExam, GrammarStatsFirstSeen, GrammarStatsWatermark, Language, TextExam
+from reling.helpers.grammar import Analyzer, PIPELINE_BATCH_SIZE, WordInfo
 from reling.utils.iterables import extract_items
 from reling.utils.tables import build_table, print_table
-from .checkpoints import colorize, since
+from .checkpoints import colorize, get_bucket, get_suffix_sums, since
 from .filter import get_filter
 from .modalities import Modality
 from .pos import Pos
@@ -25,8 +27,6 @@ __all__ = [
     'display_stats',
 ]
 
-PREPARING = 'Preparing...'
-
 TITLE = '{modality}\n(only perfect answers are included; entry = unique text or dialogue)'
 
 POS = 'Part of\nspeech'
@@ -42,6 +42,8 @@ type Threshold = int
 
 REPETITION_THRESHOLDS: list[Threshold] = [1, 3, 10, 25, 100]
 
+ANALYSIS_BATCH_SIZE = 1000
+
 
 class StatsType(TableStrEnum):
     FORMS = 'forms'
@@ -76,19 +78,12 @@ def get_normalized_form(word: WordInfo) -> NormalizedForm:
     return word.lemma, word.text.lower().replace('’', "'")
 
 
-def get_relevant_periods(stats: PeriodStats, exam: TextExam | DialogueExam) -> list[Stats]:
-    """Return the relevant statistics periods for the given exam."""
-    return [
-        stats.all_time,
-        *(checkpoint.stats for checkpoint in stats.checkpoints if checkpoint.start_time <= exam.started_at),
-    ]
-
-
-def update_stats(stats: Stats, pos: Pos, stats_type: StatsType, occurrences: int) -> None:
-    """Update the statistics with the given word."""
-    for threshold in REPETITION_THRESHOLDS:
-        if occurrences == threshold:
-            stats[pos, stats_type, threshold] += 1
+def add_stats(stats: Stats, other: Stats) -> Stats:
+    """Return the sum of the given statistics."""
+    total = defaultdict(int, stats)
+    for key, count in other.items():
+        total[key] += count
+    return total
 
 
 def get_relevant_sentences(exam: TextExam | DialogueExam, language: Language, modality: Modality) -> list[str]:
@@ -104,65 +99,213 @@ def get_relevant_sentences(exam: TextExam | DialogueExam, language: Language, mo
         ))
 
 
-class StatsHandler:
-    stats: PeriodStats
-    analyzer: Analyzer
-    lemma_content_ids: defaultdict[str, set[str]]
-    form_content_ids: defaultdict[NormalizedForm, set[str]]
+def get_modality(exam: TextExam | DialogueExam, language: Language) -> Modality:
+    """Return the modality in which the exam was taken with respect to the main language."""
+    # The source and target languages of an exam are different, so each exam belongs to a single modality
+    return Modality.COMPREHENSION if exam.source_language_id == language.id else Modality.PRODUCTION
+
+
+def get_secondary_language_id(exam: TextExam | DialogueExam, modality: Modality) -> str:
+    """Return the ID of the language the main language was paired with in the exam."""
+    return exam.target_language_id if modality == Modality.COMPREHENSION else exam.source_language_id
+
+
+def get_exam_filter(
+        language: Language,
+        modality: Modality,
+        model: type[TextExam | DialogueExam],
+        after: datetime | None,
+        until: datetime | None = None,
+) -> ColumnElement[bool]:
+    """Get the filtering condition for the exams in the main language started within the given period."""
+    return and_(
+        get_filter(language, None, modality, model),
+        *([model.started_at > after] if after else []),
+        *([model.started_at <= until] if until else []),
+    )
+
+
+def get_exams(
+        session: Session,
+        language: Language,
+        after: dict[Modality, datetime | None],
+) -> list[TextExam | DialogueExam]:
+    """
+    Return the exams in the main language in the given modalities, started after the given time for the modality
+    (if any), in the order they were started.
+    """
+    return list(merge(
+        *[(item for item in session.query(model).filter(or_(
+            *(get_exam_filter(language, modality, model, modality_after) for modality, modality_after in after.items()),
+        )).order_by(model.started_at))
+          for model in [TextExam, DialogueExam]],
+        key=lambda item: item.started_at,
+    ))
+
 
-    def __init__(self, language: Language, checkpoints: list[datetime]) -> None:
-        self.stats = PeriodStats(
-            all_time=defaultdict(int),
-            checkpoints=[Checkpoint(start_time=checkpoint, stats=defaultdict(int)) for checkpoint in checkpoints],
+def count_exams(session: Session, language: Language, modality: Modality, until: datetime) -> int:
+    """Count the exams in the main language started no later than the given time."""
+    return sum(
+        session.query(model).filter(get_exam_filter(language, modality, model, None, until)).count()
+        for model in [TextExam, DialogueExam]
+    )
+
+
+def get_watermark(session: Session, language: Language, modality: Modality) -> GrammarStatsWatermark | None:
+    """
+    Return the watermark of the data stored for the language and modality.
+    If the exams before the watermark have changed (e.g., some content has been deleted), the data is deleted.
+    """
+    watermark = session.get(GrammarStatsWatermark, (language.id, modality.value))
+    if watermark and count_exams(session, language, modality, watermark.started_at) != watermark.exam_count:
+        session.query(GrammarStatsFirstSeen).filter_by(language_id=language.id, modality=modality.value).delete()
+        session.delete(watermark)
+        return None
+    return watermark
+
+
+def update_first_seen(session: Session, language: Language, modalities: list[Modality], workers: int) -> None:
+    """
+    Record the contents in which each lemma and form are first seen (for each modality and paired language),
+    processing in a single pass only the exams started after the stored watermark of their modality.
+    With more than one worker, the uncached sentences are first analyzed in a pool of worker processes.
+    """
+    watermarks = {modality: get_watermark(session, language, modality) for modality in modalities}
+    if not (exams := get_exams(session, language, {
+        modality: watermark.started_at if watermark else None
+        for modality, watermark in watermarks.items()
+    })):
+        return
+
+    exam_counts = {modality: watermark.exam_count if watermark else 0 for modality, watermark in watermarks.items()}
+    last_started_at: dict[Modality, datetime] = {}
+    perfect: list[tuple[Modality, int, TextExam | DialogueExam, str]] = []
+    for exam in progress(exams, total=len(exams), modalities=modalities):
+        modality = get_modality(exam, language)
+        perfect.extend(
+            (modality, exam_counts[modality], exam, sentence)
+            for result, sentence in zip(exam.results, get_relevant_sentences(exam, language, modality))
+            if result.score == MAX_SCORE
         )
-        with print_and_erase(PREPARING):
-            self.analyzer = Analyzer.get(language)
-        self.lemma_content_ids = defaultdict(set)
-        self.form_content_ids = defaultdict(set)
-
-    def update(self, exam: TextExam | DialogueExam, sentence: str) -> None:
-        """Update the statistics with the given exam and sentence."""
-        for word in self.analyzer.analyze(sentence):
-            for stats_type, content_ids in [
-                (StatsType.LEMMAS, self.lemma_content_ids[word.lemma]),
-                (StatsType.FORMS, self.form_content_ids[get_normalized_form(word)]),
-            ]:
-                if exam.content_id not in content_ids:
-                    content_ids.add(exam.content_id)
-                    for period in get_relevant_periods(self.stats, exam):
-                        update_stats(period, Pos.from_upos(word.upos), stats_type, len(content_ids))
+        exam_counts[modality] += 1
+        last_started_at[modality] = exam.started_at
+
+    analyzer = Analyzer.get(language)
+    if workers > 1 and (uncached := analyzer.get_uncached(sentence for *_, sentence in perfect)):
+        for _ in progress(
+            analyzer.analyze_in_parallel(uncached, workers),
+            total=ceil(len(uncached) / PIPELINE_BATCH_SIZE),
+            modalities=modalities,
+        ):
+            pass
+    for batch in progress(
+        batched(perfect, ANALYSIS_BATCH_SIZE),
+        total=ceil(len(perfect) / ANALYSIS_BATCH_SIZE),
+        modalities=modalities,
+    ):
+        rows = [
+            {
+                'language_id': language.id,
+                'modality': modality.value,
+                'secondary_language_id': get_secondary_language_id(exam, modality),
+                'stats_type': stats_type.value,
+                'lemma': word.lemma,
+                'form': form,
+                'content_id': exam.content_id,
+                'exam_ordinal': ordinal,
+                'started_at': exam.started_at,
+                'upos': word.upos,
+            }
+            for (modality, ordinal, exam, _), words in zip(
+                batch,
+                analyzer.analyze_many(sentence for *_, sentence in batch),
+            )
+            for word in words
+            for stats_type, form in [(StatsType.LEMMAS, ''), (StatsType.FORMS, get_normalized_form(word)[1])]
+        ]
+        if rows:
+            # The rows are inserted in the order of the exams, so only the first occurrence of each is kept
+            session.execute(insert(GrammarStatsFirstSeen).prefix_with('OR IGNORE'), rows)
+    for modality, started_at in last_started_at.items():
+        session.merge(GrammarStatsWatermark(
+            language_id=language.id,
+            modality=modality.value,
+            started_at=started_at,
+            exam_count=exam_counts[modality],
+        ))
+    session.commit()
 
 
-def compute_stats(
+def get_threshold_rows(
         language: Language,
         paired: list[Language] | None,
         modality: Modality,
+) -> Select[tuple[str, str, datetime, int]]:
+    """
+    Build a query of the statistics type, UPOS, and exam start time of each lemma or form seen in its n-th content,
+    for each threshold n, considering only the exams with the given paired languages.
+    """
+    first_seen = (
+        select(
+            GrammarStatsFirstSeen.stats_type,
+            GrammarStatsFirstSeen.lemma,
+            GrammarStatsFirstSeen.form,
+            func.min(GrammarStatsFirstSeen.exam_ordinal).label('exam_ordinal'),
+            # SQLite takes the bare columns from the row with the minimum ordinal
+            GrammarStatsFirstSeen.upos,
+            GrammarStatsFirstSeen.started_at,
+        )
+        .where(
+            GrammarStatsFirstSeen.language_id == language.id,
+            GrammarStatsFirstSeen.modality == modality.value,
+            *([GrammarStatsFirstSeen.secondary_language_id.in_(language.id for language in paired)]
+              if paired is not None else []),
+        )
+        .group_by(
+            GrammarStatsFirstSeen.stats_type,
+            GrammarStatsFirstSeen.lemma,
+            GrammarStatsFirstSeen.form,
+            GrammarStatsFirstSeen.content_id,
+        )
+        .subquery()
+    )
+    ranked = select(
+        first_seen.c.stats_type,
+        first_seen.c.upos,
+        first_seen.c.started_at,
+        func.row_number().over(
+            partition_by=(first_seen.c.stats_type, first_seen.c.lemma, first_seen.c.form),
+            order_by=first_seen.c.exam_ordinal,
+        ).label('occurrences'),
+    ).subquery()
+    return select(ranked).where(ranked.c.occurrences.in_(REPETITION_THRESHOLDS))
+
+
+def compute_stats(
+        language: Language,
+        paired: list[Language] | None,
+        modalities: list[Modality],
         checkpoints: list[datetime],
-) -> PeriodStats:
-    """Compute grammar statistics for the given language(s) and modality."""
-    handler = StatsHandler(language, checkpoints)
+        workers: int,
+) -> dict[Modality, PeriodStats]:
+    """Compute grammar statistics for the given language(s) and modalities, updating the stored data first."""
+    windows = sorted(set(checkpoints))
+    stats: dict[Modality, PeriodStats] = {}
     with single_session() as session:
-        for exam in progress(
-            merge(
-                *[(item for item in session.query(model).filter(
-                    get_filter(language, paired, modality, model),
-                ).order_by(model.started_at))
-                  for model in [TextExam, DialogueExam]],
-                key=lambda item: item.started_at,
-            ),
-            total=sum(
-                session.query(model).filter(get_filter(language, paired, modality, model)).count()
-                for model in [TextExam, DialogueExam]
-            ),
-            modality=modality,
-        ):
-            for result, sentence in zip(
-                    exam.results,
-                    get_relevant_sentences(exam, language, modality),
+        update_first_seen(session, language, modalities, workers)
+        for modality in modalities:
+            buckets: list[Stats] = [defaultdict(int) for _ in range(len(windows) + 1)]
+            for stats_type, upos, started_at, occurrences in session.execute(
+                    get_threshold_rows(language, paired, modality),
             ):
-                if result.score == MAX_SCORE:
-                    handler.update(exam, sentence)
-    return handler.stats
+                buckets[get_bucket(windows, started_at)][Pos.from_upos(upos), StatsType(stats_type), occurrences] += 1
+            sums = get_suffix_sums(buckets, add_stats)
+            stats[modality] = PeriodStats(
+                all_time=sums[0],
+                checkpoints=[Checkpoint(start_time=checkpoint, stats=sums[get_bucket(windows, checkpoint)])
+                             for checkpoint in checkpoints],
+            )
+    return stats
 
 
 def format_increment(increment: int) -> str:
@@ -234,9 +377,12 @@ def print_stats(stats: PeriodStats, modality: Modality, add_dividers: bool) -> N
 def display_stats(
         language: Language,
         paired: list[Language] | None,
-        modality: Modality,
+        modalities: list[Modality],
         checkpoints: list[datetime],
+        workers: int,
 ) -> None:
-    """Display grammar statistics for the given language(s) and modality."""
-    stats = compute_stats(language, paired, modality, checkpoints)
-    print_stats(stats, modality, add_dividers=len(checkpoints) > 0)
+    """Display grammar statistics for the given language(s) and modalities."""
+    stats = compute_stats(language, paired, modalities, checkpoints, workers)
+    for modality in modalities:
+        print()
+        print_stats(stats[modality], modality, add_dividers=len(checkpoints) > 0)
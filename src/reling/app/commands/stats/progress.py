@@ -14,13 +14,13 @@ def progress[T](
         iterable: Iterable[T],
         *,
         total: int,
-        modality: Modality,
+        modalities: list[Modality],
         model: type[TextExam | DialogueExam] | None = None,
 ) -> Iterable[T]:
     """Display the progress of the given iterable."""
     return tqdm(
         iterable,
-        desc=f'Computing {modality.value} stats'
+        desc=f'Computing {' and '.join(modality.value for modality in modalities)} stats'
              + (f' for {'texts' if model == TextExam else 'dialogues'}' if model else ''),
         total=total,
         leave=False,
@@ -1,17 +1,19 @@
-from dataclasses import dataclass, field
+from __future__ import annotations
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
-from typing import Callable, cast
+from operator import add
+from typing import Callable
 
 from rich.text import Text
+from sqlalchemy import case, ColumnElement, func, Integer, literal, or_, Select, select
 
 from reling.db import single_session
-from reling.db.models import DialogueExam, Language, TextExam
+from reling.db.models import DialogueExam, DialogueExamResult, Language, TextExam, TextExamResult
 from reling.utils.time import format_time_delta
 from reling.utils.tables import build_table, GROUPING_COLUMN, print_table
-from .checkpoints import colorize, since
+from .checkpoints import colorize, get_bucket, get_suffix_sums, since
 from .filter import get_filter
 from .modalities import Modality
-from .progress import progress
 
 __all__ = [
     'display_stats',
@@ -32,6 +34,10 @@ FIRST_TIME_SENTENCES_EVALUATED = 'Sents in first-time exams'
 AVG_FTE_TIME_PER_SENTENCE = 'Avg. time/sent, first-time'
 AVG_FTS_SCORE = 'Avg. score/sent, first-time'
 
+# Dates and times are stored by SQLAlchemy in SQLite as 'YYYY-MM-DD HH:MM:SS.ffffff'
+SECONDS_LENGTH = 19
+MICROSECONDS_LENGTH = 6
+
 
 @dataclass
 class Stats:
@@ -43,6 +49,12 @@ class Stats:
     fte_time_spent: timedelta = timedelta(0)
     fts_scores_total: float = 0.0
 
+    def __add__(self, other: Stats) -> Stats:
+        return Stats(**{
+            stats_field.name: getattr(self, stats_field.name) + getattr(other, stats_field.name)
+            for stats_field in fields(self)
+        })
+
     def format_time_spent(self) -> str:
         return format_time_delta(self.time_spent)
 
@@ -73,6 +85,9 @@ class TypeStats:
     dialogue: Stats = field(default_factory=Stats)
     overall: Stats = field(default_factory=Stats)
 
+    def __add__(self, other: TypeStats) -> TypeStats:
+        return TypeStats(self.text + other.text, self.dialogue + other.dialogue, self.overall + other.overall)
+
 
 @dataclass
 class Checkpoint:
@@ -86,68 +101,119 @@ class PeriodStats:
     checkpoints: list[Checkpoint]
 
 
-def get_relevant_periods(stats: PeriodStats, exam: TextExam | DialogueExam) -> list[TypeStats]:
-    """Return the relevant statistics periods for the given exam."""
-    return [
-        stats.all_time,
-        *(checkpoint.stats for checkpoint in stats.checkpoints if checkpoint.start_time <= exam.started_at),
-    ]
+@dataclass
+class ExamTotals:
+    exams_taken: int
+    time_spent: timedelta
+    sentences_evaluated: int
+    scores_total: int
 
 
-def get_relevant_types(stats: TypeStats, exam: TextExam | DialogueExam) -> list[Stats]:
-    """Return the relevant types for the given exam."""
+def get_relevant_types(stats: TypeStats, model: type[TextExam | DialogueExam]) -> list[Stats]:
+    """Return the relevant types for the exams of the given model."""
     return [
         stats.overall,
-        stats.text if isinstance(exam, TextExam) else stats.dialogue,
+        stats.text if model == TextExam else stats.dialogue,
     ]
 
 
-def update_single_stats(stats: Stats, exam: TextExam | DialogueExam, is_first_exam: bool) -> None:
-    """Update the statistics with the given exam."""
-    sentences_evaluated = len(cast(list, exam.results))
-    scores_total = sum(result.score for result in exam.results)
-
-    stats.time_spent += exam.duration
-    stats.exams_taken += 1
-    stats.sentences_evaluated += sentences_evaluated
+def update_single_stats(stats: Stats, totals: ExamTotals, is_first_exam: bool) -> None:
+    """Update the statistics with the given exam totals."""
+    stats.time_spent += totals.time_spent
+    stats.exams_taken += totals.exams_taken
+    stats.sentences_evaluated += totals.sentences_evaluated
     if is_first_exam:
-        stats.first_time_exams_taken += 1
-        stats.first_time_sentences_evaluated += sentences_evaluated
-        stats.fte_time_spent += exam.duration
-        stats.fts_scores_total += scores_total
+        stats.first_time_exams_taken += totals.exams_taken
+        stats.first_time_sentences_evaluated += totals.sentences_evaluated
+        stats.fte_time_spent += totals.time_spent
+        stats.fts_scores_total += totals.scores_total
 
 
-def update_stats(stats: PeriodStats, exam: TextExam | DialogueExam, is_first_exam: bool) -> None:
-    """Update the statistics with the given exam."""
-    for period_stats in get_relevant_periods(stats, exam):
-        for type_stats in get_relevant_types(period_stats, exam):
-            update_single_stats(type_stats, exam, is_first_exam)
+def to_microseconds(column: ColumnElement[datetime] | ColumnElement[timedelta]) -> ColumnElement[int]:
+    """Convert a date and time (or a time interval, stored as a date and time since the epoch) to microseconds."""
+    # The seconds are truncated before the conversion, as SQLite would round the fractional part to milliseconds
+    return (func.strftime('%s', func.substr(column, 1, SECONDS_LENGTH)).cast(Integer) * 1_000_000
+            + func.substr(column, SECONDS_LENGTH + 2, MICROSECONDS_LENGTH).cast(Integer))
+
+
+def get_totals_query(
+        model: type[TextExam | DialogueExam],
+        language: Language,
+        paired: list[Language] | None,
+        modalities: list[Modality],
+        windows: list[datetime],
+) -> Select[tuple[str, int, bool, int, int, int, int]]:
+    """
+    Build a query of the exam totals grouped by the modality, by the checkpoint bucket (see `get_bucket`) of the start
+    of the exam, and by whether the exam is the first one of its content in the modality.
+    """
+    content_id, result_model, result_exam_id = ((TextExam.text_id, TextExamResult, TextExamResult.text_exam_id)
+                                                if model == TextExam else
+                                                (DialogueExam.dialogue_id, DialogueExamResult,
+                                                 DialogueExamResult.dialogue_exam_id))
+    # The source and target languages of an exam are different, so each exam belongs to at most one modality
+    exam_modality = case(
+        (model.source_language_id == language.id, Modality.COMPREHENSION.value),
+        else_=Modality.PRODUCTION.value,
+    )
+    exams = (
+        select(
+            exam_modality.label('modality'),
+            (case(
+                *((model.started_at >= windows[bucket - 1], bucket) for bucket in range(len(windows), 0, -1)),
+                else_=0,
+            ) if windows else literal(0)).label('bucket'),
+            (func.row_number().over(
+                partition_by=(exam_modality, content_id),
+                order_by=model.started_at,
+            ) == 1).label('is_first'),
+            (to_microseconds(model.finished_at) - to_microseconds(model.started_at)
+             - to_microseconds(model.total_pause_time)).label('duration'),
+            func.count(result_model.score).label('sentences'),
+            func.coalesce(func.sum(result_model.score), 0).label('scores'),
+        )
+        .outerjoin(result_model, result_exam_id == model.id)
+        .where(or_(*(get_filter(language, paired, modality, model) for modality in modalities)))
+        .group_by(model.id)
+        .subquery()
+    )
+    return select(
+        exams.c.modality,
+        exams.c.bucket,
+        exams.c.is_first,
+        func.count(),
+        func.sum(exams.c.duration),
+        func.sum(exams.c.sentences),
+        func.sum(exams.c.scores),
+    ).group_by(exams.c.modality, exams.c.bucket, exams.c.is_first)
 
 
 def compute_stats(
         language: Language,
         paired: list[Language] | None,
-        modality: Modality,
+        modalities: list[Modality],
         checkpoints: list[datetime],
-) -> PeriodStats:
-    """Compute regular statistics for the given language(s) and modality."""
+) -> dict[Modality, PeriodStats]:
+    """Compute regular statistics for the given language(s) and modalities, scanning the exams of each type once."""
+    windows = sorted(set(checkpoints))
+    buckets = {modality: [TypeStats() for _ in range(len(windows) + 1)] for modality in modalities}
     with single_session() as session:
-        stats = PeriodStats(
-            all_time=TypeStats(),
-            checkpoints=[Checkpoint(start_time=checkpoint, stats=TypeStats()) for checkpoint in checkpoints],
-        )
         for model in [TextExam, DialogueExam]:
-            seen_content_ids: set[str] = set()
-            condition = get_filter(language, paired, modality, model)
-            for exam in progress(
-                session.query(model).filter(condition).order_by(model.started_at),
-                total=session.query(model).filter(condition).count(),
-                modality=modality,
-                model=model,
+            for modality, bucket, is_first, exams_taken, duration, sentences, scores in session.execute(
+                    get_totals_query(model, language, paired, modalities, windows),
             ):
-                update_stats(stats, exam, is_first_exam=exam.content_id not in seen_content_ids)
-                seen_content_ids.add(exam.content_id)
-        return stats
+                totals = ExamTotals(exams_taken, timedelta(microseconds=duration), sentences, scores)
+                for type_stats in get_relevant_types(buckets[Modality(modality)][bucket], model):
+                    update_single_stats(type_stats, totals, is_first)
+    stats: dict[Modality, PeriodStats] = {}
+    for modality, modality_buckets in buckets.items():
+        sums = get_suffix_sums(modality_buckets, add)
+        stats[modality] = PeriodStats(
+            all_time=sums[0],
+            checkpoints=[Checkpoint(start_time=checkpoint, stats=sums[get_bucket(windows, checkpoint)])
+                         for checkpoint in checkpoints],
+        )
+    return stats
 
 
 def build_stats_section(
@@ -207,9 +273,11 @@ def print_stats(stats: PeriodStats, modality: Modality) -> None:
 def display_stats(
         language: Language,
         paired: list[Language] | None,
-        modality: Modality,
+        modalities: list[Modality],
         checkpoints: list[datetime],
 ) -> None:
-    """Display regular statistics for the given language(s) and modality."""
-    stats = compute_stats(language, paired, modality, checkpoints)
-    print_stats(stats, modality)
+    """Display regular statistics for the given language(s) and modalities."""
+    stats = compute_stats(language, paired, modalities, checkpoints)
+    for modality in modalities:
+        print()
+        print_stats(stats[modality], modality)
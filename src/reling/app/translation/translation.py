@@ -3,7 +3,7 @@ from typing import Generator
 
 from reling.db.enums import Gender
 from reling.db.models import Language
-from reling.gpt import GPTClient
+from reling.gpt import GptCallSite, GPTClient
 from reling.types import DialogueExchangeData
 from reling.utils.iterables import pair_items
 from reling.utils.transformers import add_numbering, apply, omit_empty, remove_numbering, strip
@@ -29,6 +29,7 @@ def translate_text_sentences(
             *apply(add_numbering, sentences),
         ]),
         transformers=[strip, omit_empty, remove_numbering],
+        call_site=GptCallSite.TRANSLATION,
     )
 
 
@@ -57,4 +58,5 @@ def translate_dialogue_exchanges(
             *apply(add_numbering, [turn for exchange in exchanges for turn in exchange.all()]),
         ]),
         transformers=[strip, omit_empty, remove_numbering],
+        call_site=GptCallSite.TRANSLATION,
     ))))
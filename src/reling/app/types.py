@@ -37,6 +37,7 @@ __all__ = [
     'HIDE_PROMPTS_OPT',
     'IDS_ONLY_OPT',
     'INCLUDE_OPT',
+    'INCREMENTAL_SCORING_OPT',
     'LANGUAGE_ARG',
     'LANGUAGE_OPT',
     'LANGUAGE_OPT_ARG',
@@ -59,9 +60,11 @@ __all__ = [
     'SPEAKER_GENDER_OPT',
     'SPEAKER_OPT',
     'STYLE_OPT',
+    'SUMMARY_OPT',
     'TOPIC_OPT',
     'TTS_MODEL',
     'USER_GENDER',
+    'WORKERS_OPT',
 ]
 
 ENV_PREFIX = 'RELING_'
@@ -255,6 +258,10 @@ OFFLINE_SCORING_OPT = Annotated[bool, typer.Option(
     help='Score answers using an offline algorithm.',
 )]
 
+INCREMENTAL_SCORING_OPT = Annotated[bool, typer.Option(
+    help='Score each answer in the background as soon as it is provided, rather than all answers at the end.',
+)]
+
 RETRY_OPT = Annotated[bool, typer.Option(
     help='Retry until a perfect score is achieved or the input is left blank. The best attempt will be saved.',
 )]
@@ -273,6 +280,11 @@ GRAMMAR_OPT = Annotated[bool, typer.Option(
     help='Display statistics on learned words.',
 )]
 
+WORKERS_OPT = Annotated[int, typer.Option(
+    min=1,
+    help='Number of processes that analyze the sentences missing from the grammar cache.',
+)]
+
 COMPREHENSION_OPT = Annotated[bool, typer.Option(
     help='Compute only comprehension-related statistics.',
 )]
@@ -292,3 +304,7 @@ IDS_ONLY_OPT = Annotated[bool, typer.Option(
 FORCE_OPT = Annotated[bool, typer.Option(
     help='Force execution of the operation.',
 )]
+
+SUMMARY_OPT = Annotated[bool, typer.Option(
+    help='Display a summary of the request timings by call site instead of the items.',
+)]
@@ -1,10 +1,8 @@
 from pathlib import Path
 import re
 
-from openai import OpenAI
-
+from reling.backends import Backend, get_backend
 from reling.db.models import Language
-from reling.helpers.openai import openai_handler
 from reling.types import Transcriber
 from reling.utils.strings import capitalize_first_char, universal_normalize
 
@@ -14,11 +12,11 @@ __all__ = [
 
 
 class ASRClient:
-    _client: OpenAI
+    _backend: Backend
     _model: str
 
     def __init__(self, *, api_key: str, model: str) -> None:
-        self._client = OpenAI(api_key=api_key)
+        self._backend = get_backend(api_key)
         self._model = model
 
     @staticmethod
@@ -32,13 +30,12 @@ class ASRClient:
 
     def transcribe(self, file: Path, language: Language | None = None, context: str | None = None) -> str:
         """Transcribe an audio file."""
-        with openai_handler():
-            return universal_normalize(self._normalize_transcription(self._client.audio.transcriptions.create(
-                file=file.open('rb'),
-                model=self._model,
-                language=language.short_code if language else None,
-                prompt=context,
-            ).text))
+        return universal_normalize(self._normalize_transcription(self._backend.transcribe(
+            model=self._model,
+            file=file,
+            language=language.short_code if language else None,
+            prompt=context,
+        )))
 
     def get_transcriber(self, language: Language | None = None, context: str | None = None) -> Transcriber:
         def transcribe(file: Path) -> str:
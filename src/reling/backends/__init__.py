@@ -0,0 +1,42 @@
+from functools import lru_cache
+import os
+from pathlib import Path
+
+from reling.helpers.typer import typer_raise
+from .backend import Backend
+from .openai import OpenAIBackend
+from .recording import RecordingBackend, ReplayBackend
+from .synthetic import SyntheticBackend
+
+__all__ = [
+    'Backend',
+    'get_backend',
+    'OpenAIBackend',
+    'RecordingBackend',
+    'ReplayBackend',
+    'SyntheticBackend',
+]
+
+BACKEND_VAR = 'RELING_BACKEND'
+# Supported values:
+# - "openai" (default): send the requests to the OpenAI API;
+# - "record:<path>": send the requests to the OpenAI API and append the interactions to the file;
+# - "replay:<path>": serve the interactions recorded in the file;
+# - "synthetic[:<seed>]": generate random well-formed responses.
+
+
+@lru_cache
+def get_backend(api_key: str) -> Backend:
+    """Get the backend selected by the environment variable, shared by all clients with the same API key."""
+    kind, _, argument = os.getenv(BACKEND_VAR, 'openai').partition(':')
+    match kind:
+        case 'openai':
+            return OpenAIBackend(api_key)
+        case 'record' if argument:
+            return RecordingBackend(OpenAIBackend(api_key), Path(argument))
+        case 'replay' if argument:
+            return ReplayBackend(Path(argument))
+        case 'synthetic' if not argument or argument.isdigit():
+            return SyntheticBackend(int(argument or 0))
+        case _:
+            typer_raise(f'Invalid value of {BACKEND_VAR}: "{os.getenv(BACKEND_VAR)}".')
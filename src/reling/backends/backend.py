@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from enum import StrEnum
+from hashlib import sha256
+import json
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+from reling.types import Image
+
+__all__ = [
+    'Backend',
+    'get_interaction_key',
+    'InteractionKind',
+]
+
+
+class InteractionKind(StrEnum):
+    CHAT = 'chat'
+    SPEECH = 'speech'
+    TRANSCRIPTION = 'transcription'
+
+
+def get_interaction_key(kind: str, *params: str | float | None) -> str:
+    """Build a key identifying an interaction with the provider by its kind and parameters."""
+    return sha256(json.dumps([kind, *params]).encode()).hexdigest()
+
+
+class Backend(ABC):
+    """Provider of model interactions for the GPT, TTS, and ASR clients."""
+
+    @abstractmethod
+    def stream_chat(self, model: str, prompt: str, image: Image | None, temperature: float) -> Iterator[str]:
+        """
+        Send a chat request and return an iterator over the chunks of the response.
+        The request is sent before the function returns.
+        """
+        pass
+
+    @abstractmethod
+    def astream_chat(self, model: str, prompt: str, image: Image | None, temperature: float) -> AsyncIterator[str]:
+        """Asynchronous counterpart of `stream_chat`; the request is sent on the first iteration."""
+        pass
+
+    @abstractmethod
+    def synthesize(self, model: str, text: str, voice: str, speed: float, instructions: str) -> bytes:
+        """Synthesize speech and return it as 16-bit mono PCM audio."""
+        pass
+
+    @abstractmethod
+    def transcribe(self, model: str, file: Path, language: str | None, prompt: str | None) -> str:
+        """Transcribe an audio file."""
+        pass
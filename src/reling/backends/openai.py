@@ -0,0 +1,78 @@
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Literal
+
+from openai.types.chat import ChatCompletionMessageParam
+
+from reling.helpers.openai import get_async_openai_client, get_openai_client, openai_handler
+from reling.types import Image
+from .backend import Backend
+
+__all__ = [
+    'OpenAIBackend',
+]
+
+SPEECH_RESPONSE_FORMAT: Literal['pcm'] = 'pcm'
+
+
+def build_messages(prompt: str, image: Image | None) -> list[ChatCompletionMessageParam]:
+    """Build the chat messages for a single question with an optional image."""
+    return [{'role': 'user', 'content': [
+        {'type': 'text', 'text': prompt},
+        *([{'type': 'image_url', 'image_url': {'url': image.get_url()}}] if image else []),
+    ]}]
+
+
+class OpenAIBackend(Backend):
+    """Backend sending the requests to the OpenAI API."""
+
+    _api_key: str
+
+    def __init__(self, api_key: str) -> None:
+        self._api_key = api_key
+
+    def stream_chat(self, model: str, prompt: str, image: Image | None, temperature: float) -> Iterator[str]:
+        with openai_handler():
+            stream = get_openai_client(self._api_key).chat.completions.create(
+                model=model,
+                stream=True,
+                messages=build_messages(prompt, image),
+                temperature=temperature,
+            )
+        return (chunk.choices[0].delta.content or '' for chunk in stream)
+
+    async def astream_chat(
+            self,
+            model: str,
+            prompt: str,
+            image: Image | None,
+            temperature: float,
+    ) -> AsyncIterator[str]:
+        with openai_handler():
+            stream = await get_async_openai_client(self._api_key).chat.completions.create(
+                model=model,
+                stream=True,
+                messages=build_messages(prompt, image),
+                temperature=temperature,
+            )
+        async for chunk in stream:
+            yield chunk.choices[0].delta.content or ''
+
+    def synthesize(self, model: str, text: str, voice: str, speed: float, instructions: str) -> bytes:
+        with openai_handler():
+            return get_openai_client(self._api_key).audio.speech.create(
+                model=model,
+                voice=voice,  # type: ignore
+                response_format=SPEECH_RESPONSE_FORMAT,
+                input=text,
+                speed=speed,
+                instructions=instructions,
+            ).content
+
+    def transcribe(self, model: str, file: Path, language: str | None, prompt: str | None) -> str:
+        with openai_handler(), file.open('rb') as audio:
+            return get_openai_client(self._api_key).audio.transcriptions.create(
+                file=audio,
+                model=model,
+                language=language,
+                prompt=prompt,
+            ).text
@@ -0,0 +1,146 @@
+import base64
+from collections import defaultdict, deque
+from hashlib import sha256
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Any, AsyncIterator, Iterator
+
+from reling.helpers.typer import typer_raise
+from reling.types import Image
+from .backend import Backend, get_interaction_key, InteractionKind
+
+__all__ = [
+    'RecordingBackend',
+    'ReplayBackend',
+]
+
+KEY = 'key'
+KIND = 'kind'
+CHUNKS = 'chunks'
+AUDIO = 'audio'
+TEXT = 'text'
+
+
+def get_chat_key(model: str, prompt: str, image: Image | None, temperature: float) -> str:
+    return get_interaction_key(InteractionKind.CHAT, model, prompt, image.get_digest() if image else None, temperature)
+
+
+def get_speech_key(model: str, text: str, voice: str, speed: float, instructions: str) -> str:
+    return get_interaction_key(InteractionKind.SPEECH, model, text, voice, speed, instructions)
+
+
+def get_transcription_key(model: str, file: Path, language: str | None, prompt: str | None) -> str:
+    return get_interaction_key(
+        InteractionKind.TRANSCRIPTION,
+        model,
+        sha256(file.read_bytes()).hexdigest(),
+        language,
+        prompt,
+    )
+
+
+class RecordingBackend(Backend):
+    """Backend that passes the requests to another backend and appends the interactions to a JSON Lines file."""
+
+    _inner: Backend
+    _path: Path
+    _lock: Lock
+
+    def __init__(self, inner: Backend, path: Path) -> None:
+        self._inner = inner
+        self._path = path
+        self._lock = Lock()
+
+    def _record(self, key: str, kind: InteractionKind, data: dict[str, Any]) -> None:
+        with self._lock, self._path.open('a', encoding='utf-8') as file:
+            file.write(json.dumps({KEY: key, KIND: kind.value, **data}, ensure_ascii=False) + '\n')
+
+    def stream_chat(self, model: str, prompt: str, image: Image | None, temperature: float) -> Iterator[str]:
+        stream = self._inner.stream_chat(model, prompt, image, temperature)
+
+        def record() -> Iterator[str]:
+            chunks: list[str] = []
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+            self._record(get_chat_key(model, prompt, image, temperature), InteractionKind.CHAT, {CHUNKS: chunks})
+
+        return record()
+
+    async def astream_chat(
+            self,
+            model: str,
+            prompt: str,
+            image: Image | None,
+            temperature: float,
+    ) -> AsyncIterator[str]:
+        chunks: list[str] = []
+        async for chunk in self._inner.astream_chat(model, prompt, image, temperature):
+            chunks.append(chunk)
+            yield chunk
+        self._record(get_chat_key(model, prompt, image, temperature), InteractionKind.CHAT, {CHUNKS: chunks})
+
+    def synthesize(self, model: str, text: str, voice: str, speed: float, instructions: str) -> bytes:
+        audio = self._inner.synthesize(model, text, voice, speed, instructions)
+        self._record(
+            get_speech_key(model, text, voice, speed, instructions),
+            InteractionKind.SPEECH,
+            {AUDIO: base64.b64encode(audio).decode('ascii')},
+        )
+        return audio
+
+    def transcribe(self, model: str, file: Path, language: str | None, prompt: str | None) -> str:
+        text = self._inner.transcribe(model, file, language, prompt)
+        self._record(get_transcription_key(model, file, language, prompt), InteractionKind.TRANSCRIPTION, {TEXT: text})
+        return text
+
+
+class ReplayBackend(Backend):
+    """
+    Backend that serves the interactions recorded by RecordingBackend without accessing the network.
+    Repeated requests receive the recorded responses in order; the last one is reused once they run out.
+    """
+
+    _records: defaultdict[str, deque[dict[str, Any]]]
+    _lock: Lock
+
+    def __init__(self, path: Path) -> None:
+        self._records = defaultdict(deque)
+        self._lock = Lock()
+        try:
+            with path.open(encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._records[record[KEY]].append(record)
+        except OSError as e:
+            typer_raise(f'Could not read the recorded interactions: {e}')
+
+    def _take(self, key: str, kind: InteractionKind) -> dict[str, Any]:
+        with self._lock:
+            if not (records := self._records.get(key)):
+                typer_raise(f'No recorded {kind.value} interaction matches the request.')
+            return records.popleft() if len(records) > 1 else records[0]
+
+    def stream_chat(self, model: str, prompt: str, image: Image | None, temperature: float) -> Iterator[str]:
+        return iter(self._take(get_chat_key(model, prompt, image, temperature), InteractionKind.CHAT)[CHUNKS])
+
+    async def astream_chat(
+            self,
+            model: str,
+            prompt: str,
+            image: Image | None,
+            temperature: float,
+    ) -> AsyncIterator[str]:
+        for chunk in self.stream_chat(model, prompt, image, temperature):
+            yield chunk
+
+    def synthesize(self, model: str, text: str, voice: str, speed: float, instructions: str) -> bytes:
+        return base64.b64decode(self._take(
+            get_speech_key(model, text, voice, speed, instructions),
+            InteractionKind.SPEECH,
+        )[AUDIO])
+
+    def transcribe(self, model: str, file: Path, language: str | None, prompt: str | None) -> str:
+        return self._take(get_transcription_key(model, file, language, prompt), InteractionKind.TRANSCRIPTION)[TEXT]
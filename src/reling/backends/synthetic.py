@@ -0,0 +1,144 @@
+from hashlib import sha256
+from pathlib import Path
+from random import Random
+import re
+from typing import AsyncIterator, Iterator
+
+from reling.types import Image
+from .backend import Backend
+
+__all__ = [
+    'SyntheticBackend',
+]
+
+CHUNK_SIZE = 4  # Characters per streamed chunk
+
+CONSONANTS = 'bcdfghklmnprstvz'
+VOWELS = 'aeiou'
+
+MAX_SCORE = 10
+NA = 'N/A'
+
+SPEECH_RATE = 24000  # Samples per second
+SPEECH_SECONDS_PER_CHAR = 0.06
+
+NUMBERED_LINE = re.compile(r'^\s*(\d+)[.)]\s+(.*)$')
+SENTENCE_COUNT = re.compile(r'consisting of (\d+) sentences?')
+
+
+def get_numbered_lines(lines: list[str]) -> list[tuple[int, str]]:
+    return [(int(match.group(1)), match.group(2)) for line in lines if (match := NUMBERED_LINE.match(line))]
+
+
+def get_lines_after(lines: list[str], marker: str) -> list[str]:
+    """Return the lines following the first line that starts with the marker, up to the next empty line."""
+    for index, line in enumerate(lines):
+        if line.startswith(marker):
+            following = lines[index + 1:]
+            return following[:following.index('')] if '' in following else following
+    return []
+
+
+class SyntheticResponder:
+    """Generator of random but well-formed responses to the prompts used by the application."""
+
+    _random: Random
+
+    def __init__(self, seed: str) -> None:
+        self._random = Random(seed)
+
+    def word(self) -> str:
+        return ''.join(
+            self._random.choice(CONSONANTS) + self._random.choice(VOWELS)
+            for _ in range(self._random.randint(1, 4))
+        )
+
+    def sentence(self, min_words: int = 3, max_words: int = 12) -> str:
+        words = [self.word() for _ in range(self._random.randint(min_words, max_words))]
+        return ' '.join(words).capitalize() + self._random.choice('..!?')
+
+    def alter(self, sentence: str) -> str:
+        """Replace one of the words in the sentence."""
+        words = sentence.split(' ')
+        words[self._random.randrange(len(words))] = self.word()
+        return ' '.join(words)
+
+    def score(self) -> int:
+        return min(MAX_SCORE, self._random.randint(MAX_SCORE // 2, MAX_SCORE + 2))
+
+    def scoring(self, lines: list[str]) -> list[str]:
+        """Respond to a prompt for scoring translations with five lines per translation."""
+        originals = dict(get_numbered_lines(get_lines_after(lines, 'The original ')))
+        response: list[str] = []
+        for number, translation in get_numbered_lines(get_lines_after(lines, 'The translations are:')):
+            score = self.score()
+            response.extend([
+                str(number),
+                originals.get(number, ''),
+                translation,
+                str(score),
+                self.alter(translation) if score < MAX_SCORE and translation else NA,
+            ])
+        return response
+
+    def averaging(self, prompt: str) -> list[str]:
+        """Respond to a prompt for scoring an "averaged" translation with a score and a suggestion."""
+        sentence = match.group(1) if (match := re.search(r'"""(.*?)"""', prompt, re.DOTALL)) else ''
+        score = self.score()
+        return [str(score), self.alter(sentence) if score < MAX_SCORE and sentence else NA]
+
+    def numbered(self, count: int) -> list[str]:
+        return [f'{index + 1}. {self.sentence()}' for index in range(count)]
+
+    def respond(self, prompt: str) -> str:
+        lines = prompt.split('\n')
+        if 'The translations are:' in lines:
+            response = self.scoring(lines)
+        elif 'sentence from memory' in prompt:
+            response = self.averaging(prompt)
+        elif prompt.startswith('Translate the following'):
+            response = self.numbered(len(get_numbered_lines(lines[lines.index('---') + 1:] if '---' in lines else [])))
+        elif match := SENTENCE_COUNT.search(prompt):
+            response = self.numbered(int(match.group(1)))
+        elif prompt.startswith('What should the following text be called'):
+            response = [' '.join(self.word() for _ in range(3)).title()]
+        elif prompt.startswith('What is written in the following image'):
+            response = [self.sentence()]
+        else:
+            response = [' '.join(self.sentence() for _ in range(self._random.randint(3, 8)))]
+        return '\n'.join(response)
+
+
+class SyntheticBackend(Backend):
+    """
+    Backend that generates random but well-formed responses without accessing the network,
+    to measure the application's own overhead. The responses are determined by the seed and the request.
+    """
+
+    _seed: int
+
+    def __init__(self, seed: int = 0) -> None:
+        self._seed = seed
+
+    def _get_responder(self, *params: str) -> SyntheticResponder:
+        return SyntheticResponder('\n'.join([str(self._seed), *params]))
+
+    def stream_chat(self, model: str, prompt: str, image: Image | None, temperature: float) -> Iterator[str]:
+        response = self._get_responder(model, prompt).respond(prompt)
+        return (response[index:index + CHUNK_SIZE] for index in range(0, len(response), CHUNK_SIZE))
+
+    async def astream_chat(
+            self,
+            model: str,
+            prompt: str,
+            image: Image | None,
+            temperature: float,
+    ) -> AsyncIterator[str]:
+        for chunk in self.stream_chat(model, prompt, image, temperature):
+            yield chunk
+
+    def synthesize(self, model: str, text: str, voice: str, speed: float, instructions: str) -> bytes:
+        return bytes(2 * int(SPEECH_RATE * SPEECH_SECONDS_PER_CHAR * len(text) / speed))  # Silence
+
+    def transcribe(self, model: str, file: Path, language: str | None, prompt: str | None) -> str:
+        return self._get_responder(model, sha256(file.read_bytes()).hexdigest()).sentence()
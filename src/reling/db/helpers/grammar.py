@@ -0,0 +1,26 @@
+from array import array
+import sys
+
+__all__ = [
+    'pack_ids',
+    'unpack_ids',
+]
+
+ID_TYPECODE = 'I'  # Unsigned 32-bit integers, stored in little-endian byte order
+
+
+def pack_ids(ids: list[int]) -> bytes:
+    """Pack the string ids of the analyzed words into a blob."""
+    packed = array(ID_TYPECODE, ids)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ids(blob: bytes) -> list[int]:
+    """Unpack the string ids of the analyzed words from a blob."""
+    packed = array(ID_TYPECODE)
+    packed.frombytes(blob)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tolist()
@@ -1,5 +1,10 @@
+from itertools import groupby
 from pathlib import Path
 import sqlite3
+from typing import Callable
+
+from reling.config import MAX_SCORE
+from reling.db.helpers.grammar import pack_ids
 
 __all__ = [
     'migrate',
@@ -7,8 +12,69 @@ __all__ = [
 
 ZERO_DATETIME = "'1970-01-01 00:00:00'"
 
+type MigrationCommand = str | Callable[[sqlite3.Cursor], None]
+
+
+def get_perfect_answers_commands(content: str, index: str) -> list[str]:
+    """
+    Create the table of perfect answers for texts or dialogues and fill it with the suggestions
+    and perfectly scored answers from the existing exams.
+    """
+    return [
+        f"""CREATE TABLE {content}_perfect_answers (
+            {content}_id VARCHAR NOT NULL,
+            {content}_{index}_index INTEGER NOT NULL,
+            target_language_id VARCHAR NOT NULL,
+            answer VARCHAR NOT NULL,
+            PRIMARY KEY ({content}_id, {content}_{index}_index, target_language_id, answer),
+            FOREIGN KEY({content}_id) REFERENCES {content}s (id) ON DELETE CASCADE ON UPDATE CASCADE,
+            FOREIGN KEY(target_language_id) REFERENCES languages (id)
+        )""",
+        f"""INSERT OR IGNORE INTO {content}_perfect_answers
+            SELECT exams.{content}_id, results.{content}_{index}_index, exams.target_language_id, results.answer
+            FROM {content}_exam_results results JOIN {content}_exams exams ON exams.id = results.{content}_exam_id
+            WHERE results.score = {MAX_SCORE}""",
+        f"""INSERT OR IGNORE INTO {content}_perfect_answers
+            SELECT exams.{content}_id, results.{content}_{index}_index, exams.target_language_id,
+                results.suggested_answer
+            FROM {content}_exam_results results JOIN {content}_exams exams ON exams.id = results.{content}_exam_id
+            WHERE results.suggested_answer != ''""",
+    ]
+
+
+def pack_grammar_cache(cursor: sqlite3.Cursor) -> None:
+    """Copy the cached sentences to the new table, packing the words of each into a blob of string ids."""
+    string_ids: dict[str, int] = dict(cursor.execute('SELECT value, id FROM grammar_cache_strings').fetchall())
+    packed = [
+        (language_id, sentence, pack_ids([
+            string_ids[value]
+            for *_, text, lemma, upos in words
+            if text is not None  # Sentences without words are joined with a single row of nulls
+            for value in (text, lemma, upos)
+        ]))
+        for (_, language_id, sentence), words in groupby(
+            cursor.execute("""
+                SELECT sentences.id, sentences.language_id, sentences.sentence, words.text, words.lemma, words.upos
+                FROM grammar_cache_sentences sentences
+                LEFT JOIN grammar_cache_words words ON words.sentence_id = sentences.id
+                ORDER BY sentences.id, words."index"
+            """).fetchall(),
+            key=lambda row: row[:3],
+        )
+    ]
+    cursor.executemany(
+        'INSERT INTO grammar_cache_sentences_packed (language_id, sentence, words) VALUES (?, ?, ?)',
+        packed,
+    )
+
 
-def get_migration_commands(from_version: str) -> list[str]:
+def vacuum(cursor: sqlite3.Cursor) -> None:
+    """Commit the migration and rebuild the database file to reclaim the space freed by it."""
+    cursor.connection.commit()
+    cursor.execute('VACUUM')
+
+
+def get_migration_commands(from_version: str) -> list[MigrationCommand]:
     match from_version:
         case 'a':
             return [
@@ -31,6 +97,39 @@ def get_migration_commands(from_version: str) -> list[str]:
                 'DROP TABLE styles',
                 'DROP TABLE topics',
             ]
+        case 'e':
+            return [
+                *get_perfect_answers_commands('text', 'sentence'),
+                *get_perfect_answers_commands('dialogue', 'exchange'),
+            ]
+        case 'f':
+            return [
+                """CREATE TABLE grammar_cache_strings (
+                    id INTEGER NOT NULL,
+                    value VARCHAR NOT NULL,
+                    PRIMARY KEY (id),
+                    UNIQUE (value)
+                )""",
+                """INSERT INTO grammar_cache_strings (value)
+                    SELECT text FROM grammar_cache_words
+                    UNION SELECT lemma FROM grammar_cache_words
+                    UNION SELECT upos FROM grammar_cache_words""",
+                """CREATE TABLE grammar_cache_sentences_packed (
+                    id INTEGER NOT NULL,
+                    language_id VARCHAR NOT NULL,
+                    sentence VARCHAR NOT NULL,
+                    words BLOB NOT NULL,
+                    PRIMARY KEY (id),
+                    FOREIGN KEY(language_id) REFERENCES languages (id)
+                )""",
+                pack_grammar_cache,
+                'DROP TABLE grammar_cache_words',
+                'DROP TABLE grammar_cache_sentences',
+                'ALTER TABLE grammar_cache_sentences_packed RENAME TO grammar_cache_sentences',
+                """CREATE UNIQUE INDEX grammar_cache_sentence_language_sentence
+                    ON grammar_cache_sentences (language_id, sentence)""",
+                vacuum,
+            ]
         case _:
             raise ValueError(f'Unknown migration from version {from_version}.')
 
@@ -40,6 +139,9 @@ def migrate(database: Path, from_version: str) -> None:
     cursor = connection.cursor()
     cursor.execute('PRAGMA foreign_keys=ON')
     for command in get_migration_commands(from_version):
-        cursor.execute(command)
+        if isinstance(command, str):
+            cursor.execute(command)
+        else:
+            command(cursor)
     connection.commit()
     connection.close()
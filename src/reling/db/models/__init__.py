@@ -1,9 +1,26 @@
-from .dialogues import Dialogue, DialogueExam, DialogueExamResult, DialogueExchange, DialogueExchangeTranslation
-from .grammar import GrammarCacheSentence, GrammarCacheWord
+from .dialogues import (
+    Dialogue,
+    DialogueExam,
+    DialogueExamResult,
+    DialogueExchange,
+    DialogueExchangeTranslation,
+    DialogueGradedAnswer,
+    DialoguePerfectAnswer,
+)
+from .gpt import GptCacheResponse
+from .grammar import GrammarCacheSentence, GrammarCacheString, GrammarStatsFirstSeen, GrammarStatsWatermark
 from .languages import Language
 from .misc import IdIndex
 from .modifiers import Speaker, Style, Topic
-from .texts import Text, TextExam, TextExamResult, TextSentence, TextSentenceTranslation
+from .texts import (
+    Text,
+    TextExam,
+    TextExamResult,
+    TextGradedAnswer,
+    TextPerfectAnswer,
+    TextSentence,
+    TextSentenceTranslation,
+)
 
 __all__ = [
     'Dialogue',
@@ -11,8 +28,13 @@ __all__ = [
     'DialogueExamResult',
     'DialogueExchange',
     'DialogueExchangeTranslation',
+    'DialogueGradedAnswer',
+    'DialoguePerfectAnswer',
+    'GptCacheResponse',
     'GrammarCacheSentence',
-    'GrammarCacheWord',
+    'GrammarCacheString',
+    'GrammarStatsFirstSeen',
+    'GrammarStatsWatermark',
     'IdIndex',
     'Language',
     'Speaker',
@@ -20,6 +42,8 @@ __all__ = [
     'Text',
     'TextExam',
     'TextExamResult',
+    'TextGradedAnswer',
+    'TextPerfectAnswer',
     'TextSentence',
     'TextSentenceTranslation',
     'Topic',
@@ -151,3 +151,62 @@ class DialogueExamResult(Base):
     @index.setter
     def index(self, value: int) -> None:
         self.dialogue_exchange_index = value
+
+
+class DialogueGradedAnswer(Base):
+    __tablename__ = 'dialogue_graded_answers'
+
+    dialogue_id: Mapped[str] = mapped_column(
+        ForeignKey(Dialogue.id, onupdate='CASCADE', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    dialogue_exchange_index: Mapped[int] = mapped_column(primary_key=True)
+    target_language_id: Mapped[str] = mapped_column(ForeignKey(Language.id), primary_key=True)
+    answer: Mapped[str] = mapped_column(primary_key=True)
+    score: Mapped[int]
+    suggested_answer: Mapped[str | None]
+    graded_at: Mapped[datetime]
+
+    @property
+    def content_id(self) -> str:
+        return self.dialogue_id
+
+    @content_id.setter
+    def content_id(self, value: str) -> None:
+        self.dialogue_id = value
+
+    @property
+    def index(self) -> int:
+        return self.dialogue_exchange_index
+
+    @index.setter
+    def index(self, value: int) -> None:
+        self.dialogue_exchange_index = value
+
+
+class DialoguePerfectAnswer(Base):
+    __tablename__ = 'dialogue_perfect_answers'
+
+    dialogue_id: Mapped[str] = mapped_column(
+        ForeignKey(Dialogue.id, onupdate='CASCADE', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    dialogue_exchange_index: Mapped[int] = mapped_column(primary_key=True)
+    target_language_id: Mapped[str] = mapped_column(ForeignKey(Language.id), primary_key=True)
+    answer: Mapped[str] = mapped_column(primary_key=True)
+
+    @property
+    def content_id(self) -> str:
+        return self.dialogue_id
+
+    @content_id.setter
+    def content_id(self, value: str) -> None:
+        self.dialogue_id = value
+
+    @property
+    def index(self) -> int:
+        return self.dialogue_exchange_index
+
+    @index.setter
+    def index(self, value: int) -> None:
+        self.dialogue_exchange_index = value
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from reling.db.base import Base
+
+__all__ = [
+    'GptCacheResponse',
+]
+
+
+class GptCacheResponse(Base):
+    __tablename__ = 'gpt_cache_responses'
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    response: Mapped[str]
+    size: Mapped[int]
+    hits: Mapped[int]
+    last_used_at: Mapped[datetime]
+
+    __table_args__ = (
+        Index('gpt_cache_response_last_used', 'last_used_at'),
+    )
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -6,30 +8,51 @@ from .languages import Language
 
 __all__ = [
     'GrammarCacheSentence',
-    'GrammarCacheWord',
+    'GrammarCacheString',
+    'GrammarStatsFirstSeen',
+    'GrammarStatsWatermark',
 ]
 
 
 class GrammarCacheSentence(Base):
     __tablename__ = 'grammar_cache_sentences'
 
-    id: Mapped[str] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     language_id: Mapped[str] = mapped_column(ForeignKey(Language.id))
     sentence: Mapped[str]
+    words: Mapped[bytes]  # Packed ids of the text, lemma, and UPOS of each word (see `reling.db.helpers.grammar`)
 
     __table_args__ = (
         Index('grammar_cache_sentence_language_sentence', 'language_id', 'sentence', unique=True),
     )
 
 
-class GrammarCacheWord(Base):
-    __tablename__ = 'grammar_cache_words'
+class GrammarCacheString(Base):
+    __tablename__ = 'grammar_cache_strings'
 
-    sentence_id: Mapped[str] = mapped_column(
-        ForeignKey(GrammarCacheSentence.id, onupdate='CASCADE', ondelete='CASCADE'),
-        primary_key=True,
-    )
-    index: Mapped[int] = mapped_column(primary_key=True)
-    text: Mapped[str]
-    lemma: Mapped[str]
+    id: Mapped[int] = mapped_column(primary_key=True)
+    value: Mapped[str] = mapped_column(unique=True)
+
+
+class GrammarStatsFirstSeen(Base):
+    __tablename__ = 'grammar_stats_first_seen'
+
+    language_id: Mapped[str] = mapped_column(ForeignKey(Language.id), primary_key=True)
+    modality: Mapped[str] = mapped_column(primary_key=True)
+    secondary_language_id: Mapped[str] = mapped_column(ForeignKey(Language.id), primary_key=True)
+    stats_type: Mapped[str] = mapped_column(primary_key=True)
+    lemma: Mapped[str] = mapped_column(primary_key=True)
+    form: Mapped[str] = mapped_column(primary_key=True)  # Empty for lemma statistics
+    content_id: Mapped[str] = mapped_column(primary_key=True)
+    exam_ordinal: Mapped[int]
+    started_at: Mapped[datetime]
     upos: Mapped[str]
+
+
+class GrammarStatsWatermark(Base):
+    __tablename__ = 'grammar_stats_watermarks'
+
+    language_id: Mapped[str] = mapped_column(ForeignKey(Language.id), primary_key=True)
+    modality: Mapped[str] = mapped_column(primary_key=True)
+    started_at: Mapped[datetime]
+    exam_count: Mapped[int]
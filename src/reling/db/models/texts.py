@@ -141,3 +141,56 @@ class TextExamResult(Base):
     @index.setter
     def index(self, value: int) -> None:
         self.text_sentence_index = value
+
+
+class TextGradedAnswer(Base):
+    __tablename__ = 'text_graded_answers'
+
+    text_id: Mapped[str] = mapped_column(ForeignKey(Text.id, onupdate='CASCADE', ondelete='CASCADE'), primary_key=True)
+    text_sentence_index: Mapped[int] = mapped_column(primary_key=True)
+    target_language_id: Mapped[str] = mapped_column(ForeignKey(Language.id), primary_key=True)
+    answer: Mapped[str] = mapped_column(primary_key=True)
+    score: Mapped[int]
+    suggested_answer: Mapped[str | None]
+    graded_at: Mapped[datetime]
+
+    @property
+    def content_id(self) -> str:
+        return self.text_id
+
+    @content_id.setter
+    def content_id(self, value: str) -> None:
+        self.text_id = value
+
+    @property
+    def index(self) -> int:
+        return self.text_sentence_index
+
+    @index.setter
+    def index(self, value: int) -> None:
+        self.text_sentence_index = value
+
+
+class TextPerfectAnswer(Base):
+    __tablename__ = 'text_perfect_answers'
+
+    text_id: Mapped[str] = mapped_column(ForeignKey(Text.id, onupdate='CASCADE', ondelete='CASCADE'), primary_key=True)
+    text_sentence_index: Mapped[int] = mapped_column(primary_key=True)
+    target_language_id: Mapped[str] = mapped_column(ForeignKey(Language.id), primary_key=True)
+    answer: Mapped[str] = mapped_column(primary_key=True)
+
+    @property
+    def content_id(self) -> str:
+        return self.text_id
+
+    @content_id.setter
+    def content_id(self, value: str) -> None:
+        self.text_id = value
+
+    @property
+    def index(self) -> int:
+        return self.text_sentence_index
+
+    @index.setter
+    def index(self, value: int) -> None:
+        self.text_sentence_index = value
@@ -1,28 +1,43 @@
 from typing import Generator
 
-from openai import OpenAI
-
-from reling.gpt_log import GptLogItem, log
-from reling.helpers.openai import openai_handler
+from reling.backends import Backend, get_backend
+from reling.gpt_log import GptCallSite
 from reling.types import Image
 from reling.utils.feeders import Feeder, LineFeeder
-from reling.utils.transformers import normalize, Transformer
+from reling.utils.transformers import Transformer
+from .async_client import AsyncGPTClient, DEFAULT_MAX_CONCURRENT_REQUESTS
+from .cache import ResponseCache
+from .pipeline import SectionPipeline
+from .request import get_temperature, log_response, TimingRecorder
 
 __all__ = [
+    'AsyncGPTClient',
     'GPTClient',
+    'GptCallSite',
+    'ResponseCache',
 ]
 
-CREATIVE_TEMPERATURE = 1.0
-INCOMPLETE_LOG_MARKER = '\n...'
-
 
 class GPTClient:
-    _client: OpenAI
+    _api_key: str
+    _backend: Backend
     _model: str
+    _cache: ResponseCache | None
 
-    def __init__(self, *, api_key: str, model: str) -> None:
-        self._client = OpenAI(api_key=api_key)
+    def __init__(self, *, api_key: str, model: str, cache: ResponseCache | None = None) -> None:
+        self._api_key = api_key
+        self._backend = get_backend(api_key)
         self._model = model
+        self._cache = cache
+
+    def to_async(self, max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS) -> AsyncGPTClient:
+        """Create an asynchronous client with the same credentials, model, and cache."""
+        return AsyncGPTClient(
+            api_key=self._api_key,
+            model=self._model,
+            cache=self._cache,
+            max_concurrent_requests=max_concurrent_requests,
+        )
 
     def ask(
             self,
@@ -32,52 +47,48 @@ class GPTClient:
             feeder_type: type[Feeder] = LineFeeder,
             transformers: list[Transformer] | None = None,
             auto_normalize: bool = True,
+            call_site: GptCallSite | None = None,
     ) -> Generator[str, None, None]:
         """
         Ask the model a question and yield sections of the response as they become available, applying transformers.
+        Responses to non-creative questions are taken from the cache, if one is provided.
+        The timing of the request is logged under the specified call site.
         """
-        feeder = feeder_type()
-        temperature = CREATIVE_TEMPERATURE if creative else 0.0
-
-        with openai_handler():
-            stream = self._client.chat.completions.create(
-                model=self._model,
-                stream=True,
-                messages=[{'role': 'user', 'content': [
-                    {'type': 'text', 'text': prompt},
-                    *([{'type': 'image_url', 'image_url': {'url': image.get_url()}}] if image else []),
-                ]}],
-                temperature=temperature,
-            )
+        pipeline = SectionPipeline(feeder_type, transformers, auto_normalize)
+        temperature = get_temperature(creative)
+        timing = TimingRecorder(prompt)
 
-        section_index = 0
+        cache_key = self._cache.build_key(
+            model=self._model,
+            prompt=prompt,
+            temperature=temperature,
+            image=image,
+            feeder_type=feeder_type,
+            transformers=transformers,
+            auto_normalize=auto_normalize,
+        ) if self._cache is not None and not creative else None
+        if cache_key is not None and (response := self._cache.get(cache_key)) is not None:
+            timing.on_chunk(response)
+            sections = list(timing.track(pipeline.replay(response)))
+            log_response(prompt, temperature, response, cached=True, call_site=call_site,
+                         timing=timing.finish(response))
+            yield from sections
+            return
 
-        def flush() -> Generator[str, None, None]:
-            nonlocal section_index
-            while (section := feeder.get()) is not None:
-                for transformer in (transformers or []) + ([normalize] if auto_normalize else []):
-                    section = transformer(section, section_index)
-                    if section is None:
-                        break
-                else:
-                    yield section
-                    section_index += 1
+        stream = self._backend.stream_chat(self._model, prompt, image, temperature)
 
         chunks: list[str] = []
         complete = False
         try:
             for chunk in stream:
-                content = chunk.choices[0].delta.content or ''
-                chunks.append(content)
-                feeder.put(content)
-                yield from flush()
+                timing.on_chunk(chunk)
+                chunks.append(chunk)
+                yield from timing.track(pipeline.put(chunk))
 
-            feeder.end()
-            yield from flush()
+            yield from timing.track(pipeline.end())
             complete = True
         finally:
-            log(GptLogItem(
-                prompt=prompt,
-                temperature=temperature,
-                response=''.join(chunks + ([INCOMPLETE_LOG_MARKER] if not complete else [])),
-            ))
+            response = ''.join(chunks)
+            log_response(prompt, temperature, response, complete, call_site=call_site, timing=timing.finish(response))
+        if cache_key is not None:
+            self._cache.put(cache_key, response)
@@ -0,0 +1,215 @@
+from asyncio import AbstractEventLoop, get_running_loop, Semaphore
+from functools import cache
+from typing import AsyncGenerator
+from weakref import WeakKeyDictionary
+
+from reling.backends import Backend, get_backend
+from reling.gpt_log import GptCallSite
+from reling.types import Image, Promise
+from reling.utils.background import run_in_background
+from reling.utils.feeders import Feeder, LineFeeder
+from reling.utils.transformers import Transformer
+from .cache import ResponseCache
+from .pipeline import SectionPipeline
+from .request import get_temperature, log_response, TimingRecorder
+
+__all__ = [
+    'AsyncGPTClient',
+    'DEFAULT_MAX_CONCURRENT_REQUESTS',
+]
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+
+class AsyncGPTClient:
+    """Asynchronous counterpart of GPTClient that limits the number of requests in progress at the same time."""
+
+    _backend: Backend
+    _model: str
+    _cache: ResponseCache | None
+    _max_concurrent_requests: int
+    _semaphores: WeakKeyDictionary[AbstractEventLoop, Semaphore]
+
+    def __init__(
+            self,
+            *,
+            api_key: str,
+            model: str,
+            cache: ResponseCache | None = None,
+            max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        if max_concurrent_requests < 1:
+            raise ValueError('The maximum number of concurrent requests must be positive.')
+        self._backend = get_backend(api_key)
+        self._model = model
+        self._cache = cache
+        self._max_concurrent_requests = max_concurrent_requests
+        self._semaphores = WeakKeyDictionary()
+
+    def _get_semaphore(self) -> Semaphore:
+        """Get the semaphore limiting the concurrent requests within the running event loop."""
+        loop = get_running_loop()
+        if (semaphore := self._semaphores.get(loop)) is None:
+            semaphore = self._semaphores[loop] = Semaphore(self._max_concurrent_requests)
+        return semaphore
+
+    def _get_cache_key(
+            self,
+            prompt: str,
+            image: Image | None,
+            temperature: float,
+            creative: bool,
+            feeder_type: type[Feeder],
+            transformers: list[Transformer] | None,
+            auto_normalize: bool,
+    ) -> str | None:
+        return self._cache.build_key(
+            model=self._model,
+            prompt=prompt,
+            temperature=temperature,
+            image=image,
+            feeder_type=feeder_type,
+            transformers=transformers,
+            auto_normalize=auto_normalize,
+        ) if self._cache is not None and not creative else None
+
+    async def _stream(self, prompt: str, image: Image | None, temperature: float) -> AsyncGenerator[str, None]:
+        """Yield the raw chunks of the response, occupying one of the request slots until the response is complete."""
+        async with self._get_semaphore():
+            async for chunk in self._backend.astream_chat(self._model, prompt, image, temperature):
+                yield chunk
+
+    async def _collect(
+            self,
+            prompt: str,
+            image: Image | None,
+            temperature: float,
+            pipeline: SectionPipeline,
+            timing: TimingRecorder,
+    ) -> tuple[str, list[str]]:
+        """
+        Return the complete raw response and its sections, recording the timing as the response arrives
+        (rather than when the caller gets to the result).
+        """
+        chunks: list[str] = []
+        sections: list[str] = []
+        try:
+            async for chunk in self._stream(prompt, image, temperature):
+                timing.on_chunk(chunk)
+                chunks.append(chunk)
+                sections.extend(timing.track(pipeline.put(chunk)))
+            sections.extend(timing.track(pipeline.end()))
+        finally:
+            timing.finish(''.join(chunks))
+        return ''.join(chunks), sections
+
+    async def ask(
+            self,
+            prompt: str,
+            image: Image | None = None,
+            creative: bool = True,
+            feeder_type: type[Feeder] = LineFeeder,
+            transformers: list[Transformer] | None = None,
+            auto_normalize: bool = True,
+            call_site: GptCallSite | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Ask the model a question and yield sections of the response as they become available, applying transformers.
+        The cache and the log are accessed directly, so the event loop must run in the thread owning the database
+        session; use `submit` to ask questions from synchronous code.
+        """
+        pipeline = SectionPipeline(feeder_type, transformers, auto_normalize)
+        temperature = get_temperature(creative)
+        timing = TimingRecorder(prompt)
+
+        cache_key = self._get_cache_key(prompt, image, temperature, creative, feeder_type, transformers, auto_normalize)
+        if cache_key is not None and (response := self._cache.get(cache_key)) is not None:
+            timing.on_chunk(response)
+            sections = list(timing.track(pipeline.replay(response)))
+            log_response(prompt, temperature, response, cached=True, call_site=call_site,
+                         timing=timing.finish(response))
+            for section in sections:
+                yield section
+            return
+
+        chunks: list[str] = []
+        complete = False
+        try:
+            async for chunk in self._stream(prompt, image, temperature):
+                timing.on_chunk(chunk)
+                chunks.append(chunk)
+                for section in timing.track(pipeline.put(chunk)):
+                    yield section
+
+            for section in timing.track(pipeline.end()):
+                yield section
+            complete = True
+        finally:
+            response = ''.join(chunks)
+            log_response(prompt, temperature, response, complete, call_site=call_site, timing=timing.finish(response))
+        if cache_key is not None:
+            self._cache.put(cache_key, response)
+
+    async def ask_all(
+            self,
+            prompt: str,
+            image: Image | None = None,
+            creative: bool = True,
+            feeder_type: type[Feeder] = LineFeeder,
+            transformers: list[Transformer] | None = None,
+            auto_normalize: bool = True,
+            call_site: GptCallSite | None = None,
+    ) -> list[str]:
+        """Ask the model a question and return all sections of the response."""
+        return [section async for section in self.ask(
+            prompt,
+            image=image,
+            creative=creative,
+            feeder_type=feeder_type,
+            transformers=transformers,
+            auto_normalize=auto_normalize,
+            call_site=call_site,
+        )]
+
+    def submit(
+            self,
+            prompt: str,
+            image: Image | None = None,
+            creative: bool = True,
+            feeder_type: type[Feeder] = LineFeeder,
+            transformers: list[Transformer] | None = None,
+            auto_normalize: bool = True,
+            call_site: GptCallSite | None = None,
+    ) -> Promise[list[str]]:
+        """
+        Start asking the model a question on a background event loop and return a promise of the response sections.
+        The cache and the log are only accessed from the calling thread: on submission and on resolving the promise.
+        The timing is recorded on the background event loop, so it does not include the wait before resolving.
+        """
+        pipeline = SectionPipeline(feeder_type, transformers, auto_normalize)
+        temperature = get_temperature(creative)
+        timing = TimingRecorder(prompt)
+
+        cache_key = self._get_cache_key(prompt, image, temperature, creative, feeder_type, transformers, auto_normalize)
+        if cache_key is not None and (cached_response := self._cache.get(cache_key)) is not None:
+            timing.on_chunk(cached_response)
+            sections = list(timing.track(pipeline.replay(cached_response)))
+            log_response(prompt, temperature, cached_response, cached=True, call_site=call_site,
+                         timing=timing.finish(cached_response))
+            return lambda: sections
+
+        future = run_in_background(self._collect(prompt, image, temperature, pipeline, timing))
+
+        @cache
+        def resolve() -> list[str]:
+            try:
+                response, response_sections = future.result()
+            except BaseException:
+                log_response(prompt, temperature, '', complete=False, call_site=call_site, timing=timing.timing)
+                raise
+            log_response(prompt, temperature, response, call_site=call_site, timing=timing.timing)
+            if cache_key is not None:
+                self._cache.put(cache_key, response)
+            return response_sections
+
+        return resolve
@@ -0,0 +1,89 @@
+from hashlib import sha256
+import json
+
+from sqlalchemy import func
+
+from reling.db import single_session
+from reling.db.models import GptCacheResponse
+from reling.types import Image
+from reling.utils.feeders import Feeder
+from reling.utils.time import now
+from reling.utils.transformers import Transformer
+
+__all__ = [
+    'ResponseCache',
+]
+
+DEFAULT_MAX_SIZE = 20_000_000  # Total number of characters in the cached responses
+
+
+def get_qualified_name(item: type | Transformer) -> str:
+    return f'{item.__module__}.{item.__qualname__}'
+
+
+class ResponseCache:
+    """
+    Persistent cache of the model's responses to deterministic requests.
+    The least recently used responses are evicted once the total size of the cache exceeds the limit.
+    """
+
+    _max_size: int
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self._max_size = max_size
+
+    @staticmethod
+    def build_key(
+            *,
+            model: str,
+            prompt: str,
+            temperature: float,
+            image: Image | None,
+            feeder_type: type[Feeder],
+            transformers: list[Transformer] | None,
+            auto_normalize: bool,
+    ) -> str:
+        """Build a key identifying the request along with the processing applied to the response."""
+        return sha256(json.dumps([
+            model,
+            prompt,
+            temperature,
+            image.get_digest() if image else None,
+            get_qualified_name(feeder_type),
+            [get_qualified_name(transformer) for transformer in transformers or []],
+            auto_normalize,
+        ]).encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for the key, if any, marking it as recently used."""
+        with single_session() as session:
+            entry = session.get(GptCacheResponse, key)
+            if entry is None:
+                return None
+            entry.hits += 1
+            entry.last_used_at = now()
+            session.commit()
+            return entry.response
+
+    def put(self, key: str, response: str) -> None:
+        """Cache the complete response for the key and evict the least recently used responses if necessary."""
+        with single_session() as session:
+            session.merge(GptCacheResponse(
+                key=key,
+                response=response,
+                size=len(response),
+                hits=0,
+                last_used_at=now(),
+            ))
+            session.flush()
+            excess = (session.query(func.sum(GptCacheResponse.size)).scalar() or 0) - self._max_size
+            if excess > 0:
+                evicted: list[str] = []
+                for evicted_key, size in (session.query(GptCacheResponse.key, GptCacheResponse.size)
+                                          .order_by(GptCacheResponse.last_used_at)):
+                    if excess <= 0:
+                        break
+                    evicted.append(evicted_key)
+                    excess -= size
+                session.query(GptCacheResponse).filter(GptCacheResponse.key.in_(evicted)).delete()
+            session.commit()
@@ -0,0 +1,46 @@
+from typing import Generator
+
+from reling.utils.feeders import Feeder
+from reling.utils.transformers import normalize, Transformer
+
+__all__ = [
+    'SectionPipeline',
+]
+
+
+class SectionPipeline:
+    """Pipeline that splits a response into sections with a feeder and applies transformers to each section."""
+
+    _feeder: Feeder
+    _transformers: list[Transformer]
+    _section_index: int
+
+    def __init__(self, feeder_type: type[Feeder], transformers: list[Transformer] | None, auto_normalize: bool) -> None:
+        self._feeder = feeder_type()
+        self._transformers = (transformers or []) + ([normalize] if auto_normalize else [])
+        self._section_index = 0
+
+    def _flush(self) -> Generator[str, None, None]:
+        while (section := self._feeder.get()) is not None:
+            for transformer in self._transformers:
+                section = transformer(section, self._section_index)
+                if section is None:
+                    break
+            else:
+                yield section
+                self._section_index += 1
+
+    def put(self, chunk: str) -> Generator[str, None, None]:
+        """Feed a chunk of the response and yield the sections that have become available."""
+        self._feeder.put(chunk)
+        yield from self._flush()
+
+    def end(self) -> Generator[str, None, None]:
+        """Signal the end of the response and yield the remaining sections."""
+        self._feeder.end()
+        yield from self._flush()
+
+    def replay(self, response: str) -> Generator[str, None, None]:
+        """Process a complete response at once, e.g., one retrieved from a cache."""
+        yield from self.put(response)
+        yield from self.end()
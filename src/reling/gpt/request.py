@@ -0,0 +1,72 @@
+from time import perf_counter
+from typing import Generator, Iterable
+
+from reling.gpt_log import GptCallSite, GptLogItem, GptTiming, log
+from reling.utils.time import now
+
+__all__ = [
+    'get_temperature',
+    'log_response',
+    'TimingRecorder',
+]
+
+CREATIVE_TEMPERATURE = 1.0
+INCOMPLETE_LOG_MARKER = '\n...'
+
+
+def get_temperature(creative: bool) -> float:
+    return CREATIVE_TEMPERATURE if creative else 0.0
+
+
+class TimingRecorder:
+    """Recorder of the timing of a request, from its start to the last section of the response."""
+
+    _start: float
+    _timing: GptTiming
+
+    def __init__(self, prompt: str) -> None:
+        self._start = perf_counter()
+        self._timing = GptTiming(started_at=now(), first_token=None, prompt_size=len(prompt))
+
+    def _elapsed(self) -> float:
+        return perf_counter() - self._start
+
+    def on_chunk(self, chunk: str) -> None:
+        self._timing.chunk_count += 1
+        if chunk and self._timing.first_token is None:
+            self._timing.first_token = self._elapsed()
+
+    def track(self, sections: Iterable[str]) -> Generator[str, None, None]:
+        """Pass the sections through, recording the time at which each of them becomes available."""
+        for section in sections:
+            self._timing.sections.append(self._elapsed())
+            yield section
+
+    def finish(self, response: str) -> GptTiming:
+        self._timing.total = self._elapsed()
+        self._timing.response_size = len(response)
+        return self._timing
+
+    @property
+    def timing(self) -> GptTiming:
+        return self._timing
+
+
+def log_response(
+        prompt: str,
+        temperature: float,
+        response: str,
+        complete: bool = True,
+        cached: bool = False,
+        call_site: GptCallSite | None = None,
+        timing: GptTiming | None = None,
+) -> None:
+    """Add the response to the GPT log, marking it if it is incomplete."""
+    log(GptLogItem(
+        prompt=prompt,
+        temperature=temperature,
+        response=response + (INCOMPLETE_LOG_MARKER if not complete else ''),
+        cached=cached,
+        call_site=call_site,
+        timing=timing,
+    ))
@@ -1,10 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
 
 from reling.shelf import delete_value, get_value, set_value
 
 __all__ = [
     'get_log',
+    'GptCallSite',
     'GptLogItem',
+    'GptTiming',
     'log',
 ]
 
@@ -14,11 +18,35 @@ COUNT_VAR_NAME = 'GPT_LOG_COUNT'
 CURRENT_RUN_COUNT = 0
 
 
+class GptCallSite(StrEnum):
+    SCORING = 'scoring'
+    AVERAGING = 'averaging'
+    TRANSLATION = 'translation'
+    GENERATION = 'generation'
+    SCANNING = 'scanning'
+    EXPLANATION = 'explanation'
+
+
+@dataclass
+class GptTiming:
+    """Timing of a single request; all durations are in seconds since the request was started."""
+    started_at: datetime
+    first_token: float | None
+    sections: list[float] = field(default_factory=list)
+    total: float = 0.0
+    chunk_count: int = 0
+    prompt_size: int = 0
+    response_size: int = 0
+
+
 @dataclass
 class GptLogItem:
     prompt: str
     temperature: float
     response: str
+    cached: bool = False
+    call_site: GptCallSite | None = None
+    timing: GptTiming | None = None
 
 
 def clear() -> None:
@@ -1,12 +1,12 @@
 from enum import StrEnum
-from typing import Any, Callable
+from typing import Callable
 
 from lcs2 import lcs_indices
 from rich.text import Text
 
 from reling.utils.strings import tokenize
 from .colors import default, green, red
-from .fuzzy_word import FuzzyWord
+from .fuzzy_word import fuzzy_lcs_indices, FuzzyWord
 
 __all__ = [
     'DiffType',
@@ -27,55 +27,64 @@ class DiffType(StrEnum):
             case _:
                 raise NotImplementedError
 
-    def get_normalizer(self) -> Callable[[str], Any]:
+    def align(self, a: list[str], b: list[str]) -> list[tuple[int, int]]:
+        """Return the index pairs of the aligned tokens."""
         match self:
             case DiffType.CHAR:
-                return lambda section: section
+                return lcs_indices(a, b)
             case DiffType.TOKEN:
-                return lambda section: FuzzyWord(section)
+                return fuzzy_lcs_indices(list(map(FuzzyWord, a)), list(map(FuzzyWord, b)))
             case _:
                 raise NotImplementedError
 
-    def get_weight[T](self) -> Callable[[T, T], float] | None:
-        match self:
-            case DiffType.CHAR:
-                return None
-            case DiffType.TOKEN:
-                return FuzzyWord.compare
-            case _:
-                raise NotImplementedError
 
+type Segments = list[tuple[list[str], Callable[[str], Text]]]
 
-def highlight_diff(worse: str, better: str, diff_type: DiffType = DiffType.TOKEN) -> tuple[Text, Text]:
-    """Return the formatted pair of strings, highlighting the difference between the two."""
-    tokenizer, normalizer, weight = diff_type.get_tokenizer(), diff_type.get_normalizer(), diff_type.get_weight()
-    worse_tokens, better_tokens = tokenizer(worse), tokenizer(better)
-    lcs = lcs_indices(
-        *([normalizer(token) for token in tokens] for tokens in (worse_tokens, better_tokens)),
-        weight=weight,
-    )
-    worse_segments: list[Text] = []
-    better_segments: list[Text] = []
 
+def add_segment(segments: Segments, text: str, color: Callable[[str], Text]) -> None:
+    """Add a segment of text, merging it with the previous one if they share the color."""
+    if not text:
+        return
+    if segments and segments[-1][1] is color:
+        segments[-1][0].append(text)
+    else:
+        segments.append(([text], color))
+
+
+def assemble(segments: Segments) -> Text:
+    """Assemble the colored segments into a single text at once."""
+    return Text.assemble(*(color(''.join(parts)) for parts, color in segments))
+
+
+def collect_diff_segments(
+        worse: str,
+        better: str,
+        diff_type: DiffType,
+        worse_segments: Segments,
+        better_segments: Segments,
+) -> None:
+    """Add the colored segments of the pair of strings, highlighting the difference between the two."""
+    tokenizer = diff_type.get_tokenizer()
+    worse_tokens, better_tokens = tokenizer(worse), tokenizer(better)
     worse_cursor = better_cursor = 0
-    for worse_index, better_index in lcs + [(len(worse_tokens), len(better_tokens))]:
-        worse_segments.append(red(''.join(worse_tokens[worse_cursor:worse_index])))
-        better_segments.append(green(''.join(better_tokens[better_cursor:better_index])))
-        if (worse_index, better_index) == (len(worse_tokens), len(better_tokens)):
-            break
-        match diff_type:
-            case DiffType.CHAR:
-                worse_segments.append(default(worse_tokens[worse_index]))
-                better_segments.append(default(better_tokens[better_index]))
-            case DiffType.TOKEN:
-                worse_segment, better_segment = highlight_diff(
-                    worse_tokens[worse_index],
-                    better_tokens[better_index],
-                    DiffType.CHAR,
-                )
-                worse_segments.append(worse_segment)
-                better_segments.append(better_segment)
+    for worse_index, better_index in diff_type.align(worse_tokens, better_tokens):
+        add_segment(worse_segments, ''.join(worse_tokens[worse_cursor:worse_index]), red)
+        add_segment(better_segments, ''.join(better_tokens[better_cursor:better_index]), green)
+        worse_token, better_token = worse_tokens[worse_index], better_tokens[better_index]
+        if diff_type == DiffType.CHAR or worse_token == better_token:
+            add_segment(worse_segments, worse_token, default)
+            add_segment(better_segments, better_token, default)
+        else:
+            collect_diff_segments(worse_token, better_token, DiffType.CHAR, worse_segments, better_segments)
         worse_cursor = worse_index + 1
         better_cursor = better_index + 1
+    add_segment(worse_segments, ''.join(worse_tokens[worse_cursor:]), red)
+    add_segment(better_segments, ''.join(better_tokens[better_cursor:]), green)
+
 
-    return sum(worse_segments, Text('')), sum(better_segments, Text(''))
+def highlight_diff(worse: str, better: str, diff_type: DiffType = DiffType.TOKEN) -> tuple[Text, Text]:
+    """Return the formatted pair of strings, highlighting the difference between the two."""
+    worse_segments: Segments = []
+    better_segments: Segments = []
+    collect_diff_segments(worse, better, diff_type, worse_segments, better_segments)
+    return assemble(worse_segments), assemble(better_segments)
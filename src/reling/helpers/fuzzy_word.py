@@ -1,8 +1,34 @@
 from __future__ import annotations
 
-from lcs2 import lcs_length
+from functools import lru_cache
+
+from lcs2 import lcs_indices
+
+from reling.utils.lcs import lcs_length
+
+__all__ = [
+    'fuzzy_lcs_indices',
+    'FuzzyWord',
+    'SimilarityMatrix',
+]
 
 SHARED_THRESHOLD = 0.61
+SIMILARITY_CACHE_SIZE = 65536  # Number of distinct pairs of normalized words
+
+
+@lru_cache(maxsize=SIMILARITY_CACHE_SIZE)
+def get_similarity(a: str, b: str) -> float:
+    """Return the similarity score between two normalized words (see `FuzzyWord.compare`)."""
+    if not a and not b:
+        return 1.0
+    shared_count = lcs_length(a, b)
+    shared_ratio = 2 * shared_count / (len(a) + len(b))
+    return shared_count * shared_ratio if shared_ratio >= SHARED_THRESHOLD else 0.0
+
+
+def get_symmetric_similarity(a: str, b: str) -> float:
+    """Return the similarity score, sharing the cached value between the two orders of the arguments."""
+    return get_similarity(a, b) if a <= b else get_similarity(b, a)
 
 
 class FuzzyWord:
@@ -11,6 +37,10 @@ class FuzzyWord:
     def __init__(self, word: str) -> None:
         self._normalized = word.lower()
 
+    @property
+    def normalized(self) -> str:
+        return self._normalized
+
     @staticmethod
     def compare(a: FuzzyWord, b: FuzzyWord) -> float:
         """
@@ -18,8 +48,31 @@ class FuzzyWord:
         Two words are considered more similar if, when lowercased, they share a greater number
         of characters and have a higher ratio of shared characters.
         """
-        if not a._normalized and not b._normalized:
-            return 1.0
-        shared_count = lcs_length(a._normalized, b._normalized)
-        shared_ratio = 2 * shared_count / (len(a._normalized) + len(b._normalized))
-        return shared_count * shared_ratio if shared_ratio >= SHARED_THRESHOLD else 0.0
+        return get_symmetric_similarity(a._normalized, b._normalized)
+
+
+class SimilarityMatrix:
+    """Similarity scores between the words of two sequences, computed once per distinct pair of normalized words."""
+
+    _a_ids: list[int]
+    _b_ids: list[int]
+    _matrix: list[list[float]]
+
+    def __init__(self, a: list[FuzzyWord], b: list[FuzzyWord]) -> None:
+        a_unique: dict[str, int] = {}
+        b_unique: dict[str, int] = {}
+        self._a_ids = [a_unique.setdefault(word.normalized, len(a_unique)) for word in a]
+        self._b_ids = [b_unique.setdefault(word.normalized, len(b_unique)) for word in b]
+        self._matrix = [
+            [get_symmetric_similarity(a_word, b_word) for b_word in b_unique]
+            for a_word in a_unique
+        ]
+
+    def weight(self, a_index: int, b_index: int) -> float:
+        """Return the similarity score between the words at the specified positions of the two sequences."""
+        return self._matrix[self._a_ids[a_index]][self._b_ids[b_index]]
+
+
+def fuzzy_lcs_indices(a: list[FuzzyWord], b: list[FuzzyWord]) -> list[tuple[int, int]]:
+    """Return the index pairs of the words aligned by the longest common subsequence weighted by their similarity."""
+    return lcs_indices(range(len(a)), range(len(b)), weight=SimilarityMatrix(a, b).weight)
@@ -1,113 +1,229 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from functools import lru_cache
-from typing import cast, TYPE_CHECKING
+from itertools import batched
+from typing import Generator, Iterable, TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from stanza import Pipeline
+    from stanza import Document, Pipeline
+
+from sqlalchemy import insert
 
 from reling.db import Session, single_session
-from reling.db.models import GrammarCacheSentence, GrammarCacheWord, Language
-from reling.utils.ids import generate_id
-from .typer import typer_raise, typer_raise_import
+from reling.db.helpers.grammar import pack_ids, unpack_ids
+from reling.db.models import GrammarCacheSentence, GrammarCacheString, Language
+from reling.utils.iterables import group_items
+from .pipelines import load_pipeline, PIPELINES
 
 __all__ = [
     'Analyzer',
+    'PIPELINE_BATCH_SIZE',
     'WordInfo',
 ]
 
-PROCESSORS = 'tokenize,pos,lemma'
-
 EXCLUDED_UPOS = {'PUNCT', 'SYM', 'X'}
 
+PIPELINE_BATCH_SIZE = 64
 
-@dataclass
+QUERY_CHUNK_SIZE = 500  # Stays well below the SQLite limit on the number of query parameters
+
+
+@dataclass(frozen=True)
 class WordInfo:
     text: str
     lemma: str
     upos: str
 
 
+def extract_words(document: Document) -> list[WordInfo]:
+    """Extract the relevant words from a processed document."""
+    return [
+        WordInfo(
+            text=word.text,
+            lemma=word.lemma,
+            upos=word.upos,
+        )
+        for nlp_sentence in document.sentences
+        for word in nlp_sentence.words
+        if word.upos not in EXCLUDED_UPOS
+    ]
+
+
+WORKER_PIPELINE: Pipeline | None = None
+
+
+def init_worker(language_code: str) -> None:
+    """Create the pipeline of a worker process from the models already downloaded by the parent process."""
+    global WORKER_PIPELINE
+    WORKER_PIPELINE = load_pipeline(language_code)
+
+
+def analyze_in_worker(sentences: list[str]) -> list[list[WordInfo]]:
+    """Analyze the sentences with the pipeline of the worker process."""
+    assert WORKER_PIPELINE is not None
+    return [extract_words(document) for document in WORKER_PIPELINE.bulk_process(sentences)]
+
+
 @dataclass
 class Analyzer:
-    _nlp: Pipeline
     language: Language
+    _strings: dict[int, str] = field(default_factory=dict)  # Interned strings loaded from the cache, by id
+    _string_ids: dict[str, int] = field(default_factory=dict)
+    _words: dict[tuple[int, int, int], WordInfo] = field(default_factory=dict)  # Shared by the cached sentences
 
     @staticmethod
     @lru_cache
     def get(language: Language) -> Analyzer:
-        """Get a Stanza pipeline for the specified language."""
-        try:
-            import stanza
-            from stanza.resources.common import UnknownLanguageError
-        except ImportError:
-            raise typer_raise_import('Stanza')
-        import logging
-        stanza_logger = logging.getLogger('stanza')
-        stanza_logger.setLevel(logging.ERROR)
-        try:
-            stanza.download(language.short_code)
-        except UnknownLanguageError:
-            raise typer_raise(f'{language.name} is not supported by Stanza.')
-        return Analyzer(
-            _nlp=stanza.Pipeline(language.short_code, processors=PROCESSORS),
-            language=language,
-        )
+        """Get an analyzer for the specified language; its Stanza pipeline is loaded only once it is needed."""
+        return Analyzer(language=language)
 
-    def _get_analysis_from_cache(self, session: Session, sentence: str) -> list[WordInfo] | None:
-        """Get the analysis of a sentence from the cache."""
-        return [
-            WordInfo(
-                text=cast(str, word.text),
-                lemma=cast(str, word.lemma),
-                upos=cast(str, word.upos),
+    @property
+    def _nlp(self) -> Pipeline:
+        return PIPELINES.get(self.language)
+
+    def _load_strings(self, session: Session, ids: set[int]) -> None:
+        """Load the interned strings with the given ids that have not been loaded yet."""
+        for chunk in batched(ids - self._strings.keys(), QUERY_CHUNK_SIZE):
+            for string_id, value in session.query(GrammarCacheString.id, GrammarCacheString.value).filter(
+                    GrammarCacheString.id.in_(chunk),
+            ):
+                self._strings[string_id] = value
+                self._string_ids[value] = string_id
+
+    def _load_string_ids(self, session: Session, values: set[str]) -> None:
+        """Load the ids of the interned strings with the given values that have not been loaded yet."""
+        for chunk in batched(values - self._string_ids.keys(), QUERY_CHUNK_SIZE):
+            for string_id, value in session.query(GrammarCacheString.id, GrammarCacheString.value).filter(
+                    GrammarCacheString.value.in_(chunk),
+            ):
+                self._strings[string_id] = value
+                self._string_ids[value] = string_id
+
+    def _intern_strings(self, session: Session, values: set[str]) -> None:
+        """Make sure that all the strings are interned and their ids are loaded."""
+        self._load_string_ids(session, values)
+        if new := values - self._string_ids.keys():
+            session.execute(insert(GrammarCacheString), [{'value': value} for value in new])
+            self._load_string_ids(session, new)
+
+    def _get_word(self, key: tuple[int, int, int]) -> WordInfo:
+        """Get the word with the given ids of its text, lemma, and UPOS."""
+        if (word := self._words.get(key)) is None:
+            text, lemma, upos = key
+            word = self._words[key] = WordInfo(
+                text=self._strings[text],
+                lemma=self._strings[lemma],
+                upos=self._strings[upos],
             )
-            for word in (session.query(GrammarCacheWord)
-                         .filter_by(sentence_id=cached_sentence.id)
-                         .order_by(GrammarCacheWord.index).all())
-        ] if (cached_sentence := session.query(GrammarCacheSentence).filter_by(
-            language_id=self.language.id,
-            sentence=sentence,
-        ).first()) else None
-
-    def _put_analysis_to_cache(self, session: Session, sentence: str, words: list[WordInfo]) -> None:
-        """Put the analysis of a sentence to the cache."""
-        sentence_id = generate_id()
-        cached_sentence = GrammarCacheSentence(
-            id=sentence_id,
-            language_id=self.language.id,
-            sentence=sentence,
-        )
-        session.add(cached_sentence)
-        for index, word in enumerate(words):
-            session.add(GrammarCacheWord(
-                sentence_id=sentence_id,
-                index=index,
-                text=word.text,
-                lemma=word.lemma,
-                upos=word.upos,
-            ))
+        return word
+
+    def _get_analyses_from_cache(self, session: Session, sentences: set[str]) -> dict[str, list[WordInfo]]:
+        """Get the analyses of the cached sentences, querying them in chunks of `QUERY_CHUNK_SIZE`."""
+        packed = {
+            sentence: unpack_ids(words)
+            for chunk in batched(sentences, QUERY_CHUNK_SIZE)
+            for sentence, words in session.query(GrammarCacheSentence.sentence, GrammarCacheSentence.words).filter(
+                GrammarCacheSentence.language_id == self.language.id,
+                GrammarCacheSentence.sentence.in_(chunk),
+            )
+        }
+        self._load_strings(session, {string_id for ids in packed.values() for string_id in ids})
+        return {sentence: [self._get_word(key) for key in group_items(ids, 3)] for sentence, ids in packed.items()}
+
+    def _get_cached_sentences(self, session: Session, sentences: set[str]) -> set[str]:
+        """Return the sentences that are in the cache, querying them in chunks of `QUERY_CHUNK_SIZE`."""
+        return {
+            sentence
+            for chunk in batched(sentences, QUERY_CHUNK_SIZE)
+            for sentence, in session.query(GrammarCacheSentence.sentence).filter(
+                GrammarCacheSentence.language_id == self.language.id,
+                GrammarCacheSentence.sentence.in_(chunk),
+            )
+        }
+
+    def _put_analyses_to_cache(self, session: Session, analyses: dict[str, list[WordInfo]]) -> None:
+        """Put the analyses of sentences to the cache with a single bulk insert, interning their strings."""
+        self._intern_strings(session, {
+            value
+            for words in analyses.values()
+            for word in words
+            for value in (word.text, word.lemma, word.upos)
+        })
+        string_ids = self._string_ids
+        if analyses:
+            session.execute(insert(GrammarCacheSentence), [
+                {
+                    'language_id': self.language.id,
+                    'sentence': sentence,
+                    'words': pack_ids([
+                        string_ids[value]
+                        for word in words
+                        for value in (word.text, word.lemma, word.upos)
+                    ]),
+                }
+                for sentence, words in analyses.items()
+            ])
         session.commit()
 
-    def _do_analyze(self, sentence: str) -> list[WordInfo]:
-        """Analyze a sentence."""
+    def run_pipeline(self, sentences: list[str], batch_size: int = PIPELINE_BATCH_SIZE) -> list[list[WordInfo]]:
+        """
+        Analyze the sentences with the pipeline, bypassing the cache.
+        The sentences are processed in batches of `batch_size` documents, one document per sentence,
+        so that each processor of the pipeline handles a whole batch at once.
+        """
         return [
-            WordInfo(
-                text=word.text,
-                lemma=word.lemma,
-                upos=word.upos,
-            )
-            for nlp_sentence in self._nlp(sentence).sentences
-            for word in nlp_sentence.words
-            if word.upos not in EXCLUDED_UPOS
+            extract_words(document)
+            for batch in batched(sentences, batch_size)
+            for document in self._nlp.bulk_process(list(batch))
         ]
 
+    def analyze_many(self, sentences: Iterable[str], batch_size: int = PIPELINE_BATCH_SIZE) -> list[list[WordInfo]]:
+        """
+        Analyze the sentences, in order, and cache the results.
+        The cached sentences are resolved at once, and only the remaining ones are passed to the pipeline,
+        in batches of `batch_size`.
+        """
+        sentences = list(sentences)
+        with single_session() as session:
+            analyses = self._get_analyses_from_cache(session, set(sentences))
+            if missing := [sentence for sentence in dict.fromkeys(sentences) if sentence not in analyses]:
+                missing_analyses = dict(zip(missing, self.run_pipeline(missing, batch_size)))
+                self._put_analyses_to_cache(session, missing_analyses)
+                analyses.update(missing_analyses)
+        return [analyses[sentence] for sentence in sentences]
+
+    def get_uncached(self, sentences: Iterable[str]) -> list[str]:
+        """Return the distinct sentences that are not in the cache yet, in order of their first occurrence."""
+        sentences = list(dict.fromkeys(sentences))
+        with single_session() as session:
+            cached = self._get_cached_sentences(session, set(sentences))
+        return [sentence for sentence in sentences if sentence not in cached]
+
+    def analyze_in_parallel(
+            self,
+            sentences: list[str],
+            workers: int,
+            batch_size: int = PIPELINE_BATCH_SIZE,
+    ) -> Generator[list[str], None, None]:
+        """
+        Analyze the distinct uncached sentences in a pool of worker processes, each holding its own pipeline,
+        and cache the results from this process as each batch of `batch_size` sentences is completed.
+        Yield the completed batches.
+        """
+        PIPELINES.ensure_models(self.language)
+        with (
+            ProcessPoolExecutor(workers, initializer=init_worker, initargs=(self.language.short_code,)) as executor,
+            single_session() as session,
+        ):
+            futures = {
+                executor.submit(analyze_in_worker, list(batch)): batch
+                for batch in batched(sentences, batch_size)
+            }
+            for future in as_completed(futures):
+                self._put_analyses_to_cache(session, dict(zip(futures[future], future.result())))
+                yield list(futures[future])
+
     def analyze(self, sentence: str) -> list[WordInfo]:
         """Analyze a sentence and cache the result."""
-        with single_session() as session:
-            if (words := self._get_analysis_from_cache(session, sentence)) is not None:
-                return words
-            else:
-                words = self._do_analyze(sentence)
-                self._put_analysis_to_cache(session, sentence, words)
-                return words
+        return self.analyze_many([sentence])[0]
@@ -1,18 +1,126 @@
 from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+import os
+from threading import Lock
 from typing import Generator
 
-from openai import APIError
+from httpx import Limits, Timeout
+from openai import APIError, AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 
 from .typer import typer_raise
 
 __all__ = [
+    'get_async_openai_client',
+    'get_openai_client',
     'openai_handler',
 ]
 
 
+MAX_CONNECTIONS_VAR = 'RELING_MAX_CONNECTIONS'
+MAX_KEEPALIVE_CONNECTIONS_VAR = 'RELING_MAX_KEEPALIVE_CONNECTIONS'
+KEEPALIVE_EXPIRY_VAR = 'RELING_KEEPALIVE_EXPIRY'
+CONNECT_TIMEOUT_VAR = 'RELING_CONNECT_TIMEOUT'
+TIMEOUT_VAR = 'RELING_TIMEOUT'
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0  # Seconds
+    connect_timeout: float = 10.0  # Seconds
+    timeout: float = 600.0  # Seconds
+
+    def get_limits(self) -> Limits:
+        return Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def get_timeout(self) -> Timeout:
+        return Timeout(self.timeout, connect=self.connect_timeout)
+
+
+type ClientKey = tuple[str, str | None]  # API key and base URL
+
+DEFAULT_POOL_SETTINGS = PoolSettings()
+CLIENTS: dict[ClientKey, OpenAI] = {}
+ASYNC_CLIENTS: dict[ClientKey, AsyncOpenAI] = {}
+CLIENTS_LOCK = Lock()
+
+
 @contextmanager
 def openai_handler() -> Generator[None, None, None]:
     try:
         yield
     except APIError as e:
         typer_raise(f'OpenAI API error:\n{e}')
+
+
+def read_positive[T: (int, float)](var: str, default: T) -> T:
+    """Read a positive number of the same type as the default from the environment variable, if it is set."""
+    if (value := os.getenv(var)) is None:
+        return default
+    try:
+        number = type(default)(value)
+    except ValueError:
+        number = None
+    if number is None or not number > 0:
+        expected = 'a positive integer' if isinstance(default, int) else 'a positive number'
+        typer_raise(f'Invalid value of {var}: "{value}" (expected {expected}).')
+    return number
+
+
+@lru_cache
+def get_pool_settings() -> PoolSettings:
+    """Get the connection pool limits and timeouts, as set by the environment variables."""
+    return PoolSettings(
+        max_connections=read_positive(MAX_CONNECTIONS_VAR, DEFAULT_POOL_SETTINGS.max_connections),
+        max_keepalive_connections=read_positive(
+            MAX_KEEPALIVE_CONNECTIONS_VAR,
+            DEFAULT_POOL_SETTINGS.max_keepalive_connections,
+        ),
+        keepalive_expiry=read_positive(KEEPALIVE_EXPIRY_VAR, DEFAULT_POOL_SETTINGS.keepalive_expiry),
+        connect_timeout=read_positive(CONNECT_TIMEOUT_VAR, DEFAULT_POOL_SETTINGS.connect_timeout),
+        timeout=read_positive(TIMEOUT_VAR, DEFAULT_POOL_SETTINGS.timeout),
+    )
+
+
+def get_openai_client(api_key: str, base_url: str | None = None) -> OpenAI:
+    """
+    Get the process-wide OpenAI client for the API key and base URL, so that connections are pooled and kept alive
+    across all the requests made with the same credentials.
+    The pool settings are read from the environment variables when the first client is created.
+    """
+    with CLIENTS_LOCK:
+        if (client := CLIENTS.get((api_key, base_url))) is None:
+            settings = get_pool_settings()
+            client = CLIENTS[api_key, base_url] = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=settings.get_timeout(),
+                http_client=DefaultHttpxClient(
+                    limits=settings.get_limits(),
+                    timeout=settings.get_timeout(),
+                ),
+            )
+        return client
+
+
+def get_async_openai_client(api_key: str, base_url: str | None = None) -> AsyncOpenAI:
+    """Get the process-wide asynchronous OpenAI client for the API key and base URL (see `get_openai_client`)."""
+    with CLIENTS_LOCK:
+        if (client := ASYNC_CLIENTS.get((api_key, base_url))) is None:
+            settings = get_pool_settings()
+            client = ASYNC_CLIENTS[api_key, base_url] = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=settings.get_timeout(),
+                http_client=DefaultAsyncHttpxClient(
+                    limits=settings.get_limits(),
+                    timeout=settings.get_timeout(),
+                ),
+            )
+        return client
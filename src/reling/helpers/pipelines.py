@@ -0,0 +1,134 @@
+from __future__ import annotations
+from collections import OrderedDict
+import os
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from stanza import Pipeline
+
+from reling.db.models import Language
+from reling.shelf import get_value, set_value
+from .typer import typer_raise, typer_raise_import
+
+__all__ = [
+    'load_pipeline',
+    'PIPELINES',
+    'PipelineManager',
+]
+
+PROCESSORS = 'tokenize,pos,lemma'
+
+MANIFEST_KEY = 'stanza_models'
+
+MEMORY_BUDGET_VAR = 'RELING_GRAMMAR_MEMORY_MB'
+DEFAULT_MEMORY_BUDGET_MB = 2048
+MIN_PIPELINE_SIZE_MB = 256  # Charged for a pipeline whose model files cannot be found in its configuration
+
+MB = 1024 * 1024
+
+
+def import_stanza() -> ModuleType:
+    """Import Stanza and silence its logging."""
+    try:
+        import stanza
+    except ImportError:
+        raise typer_raise_import('Stanza')
+    import logging
+    logging.getLogger('stanza').setLevel(logging.ERROR)
+    return stanza
+
+
+def load_pipeline(language_code: str) -> Pipeline:
+    """Load the pipeline for the language from the models already downloaded, without network access."""
+    return import_stanza().Pipeline(language_code, processors=PROCESSORS, download_method=None)
+
+
+def get_memory_budget() -> int:
+    """Get the memory budget for the loaded pipelines in bytes, as set by the environment variable."""
+    value = os.getenv(MEMORY_BUDGET_VAR, str(DEFAULT_MEMORY_BUDGET_MB))
+    if not value.isdigit():
+        typer_raise(f'Invalid value of {MEMORY_BUDGET_VAR}: "{value}" (expected a number of megabytes).')
+    return int(value) * MB
+
+
+def estimate_size(pipeline: Pipeline) -> int:
+    """
+    Estimate the memory used by the pipeline as the total size of the model files it has loaded,
+    but no less than the minimum size, so that every loaded pipeline counts towards the memory budget.
+    """
+    return max(sum(
+        Path(value).stat().st_size
+        for key, value in getattr(pipeline, 'config', {}).items()
+        if key.endswith('_path') and isinstance(value, str) and Path(value).is_file()
+    ), MIN_PIPELINE_SIZE_MB * MB)
+
+
+class PipelineManager:
+    """
+    Stanza pipelines, loaded on first use and unloaded, least recently used first, to keep the total size
+    of the loaded models within the memory budget.
+    The languages whose models have been downloaded are recorded in a manifest in the shelf,
+    so that the models are not checked for updates over the network each time they are loaded.
+    Unless given in bytes, the memory budget is read from the environment variable when the first pipeline is loaded.
+    """
+
+    _memory_budget: int | None
+    _pipelines: OrderedDict[str, tuple[Pipeline, int]]
+
+    def __init__(self, memory_budget: int | None = None) -> None:
+        self._memory_budget = memory_budget
+        self._pipelines = OrderedDict()
+
+    def ensure_models(self, language: Language) -> None:
+        """Download the models for the language unless the manifest records them for the installed Stanza."""
+        stanza = import_stanza()
+        from stanza.resources.common import UnknownLanguageError
+        manifest: dict[str, str] = get_value(MANIFEST_KEY, {})
+        if manifest.get(language.short_code) != stanza.__version__:
+            try:
+                stanza.download(language.short_code, processors=PROCESSORS)
+            except UnknownLanguageError:
+                raise typer_raise(f'{language.name} is not supported by Stanza.')
+            set_value(MANIFEST_KEY, {**manifest, language.short_code: stanza.__version__})
+
+    def _forget_models(self, language: Language) -> None:
+        """Remove the language from the manifest, so that its models are downloaded again."""
+        manifest: dict[str, str] = get_value(MANIFEST_KEY, {})
+        manifest.pop(language.short_code, None)
+        set_value(MANIFEST_KEY, manifest)
+
+    def _get_memory_budget(self) -> int:
+        """Get the memory budget in bytes, reading it from the environment variable on first use."""
+        if self._memory_budget is None:
+            self._memory_budget = get_memory_budget()
+        return self._memory_budget
+
+    def _evict(self, size: int, memory_budget: int) -> None:
+        """Unload the least recently used pipelines until there is room for a pipeline of the given size."""
+        loaded_size = sum(pipeline_size for _, pipeline_size in self._pipelines.values())
+        while self._pipelines and loaded_size + size > memory_budget:
+            _, (_, evicted_size) = self._pipelines.popitem(last=False)
+            loaded_size -= evicted_size
+
+    def get(self, language: Language) -> Pipeline:
+        """Get the pipeline for the language, loading it (and downloading the models) if necessary."""
+        if (loaded := self._pipelines.get(language.short_code)) is not None:
+            self._pipelines.move_to_end(language.short_code)
+            return loaded[0]
+        memory_budget = self._get_memory_budget()  # Before loading the models, so that an invalid value fails fast
+        self.ensure_models(language)
+        try:
+            pipeline = load_pipeline(language.short_code)
+        except FileNotFoundError:  # The models were removed after being recorded in the manifest
+            self._forget_models(language)
+            self.ensure_models(language)
+            pipeline = load_pipeline(language.short_code)
+        size = estimate_size(pipeline)
+        self._evict(size, memory_budget)
+        self._pipelines[language.short_code] = pipeline, size
+        return pipeline
+
+
+PIPELINES = PipelineManager()
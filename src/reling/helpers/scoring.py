@@ -1,17 +1,23 @@
+from __future__ import annotations
+
+from collections import Counter
 from math import ceil, floor
 from statistics import mean
+from typing import Iterable, Sequence
 
-from lcs2 import diff, lcs_indices, lcs_length
+from lcs2 import diff
 
 from reling.config import MAX_SCORE
 from reling.db.models import DialogueExam, TextExam
+from reling.utils.lcs import lcs_length, LcsPattern
 from reling.utils.strings import tokenize
-from .fuzzy_word import FuzzyWord
+from .fuzzy_word import fuzzy_lcs_indices, FuzzyWord
 
 __all__ = [
     'calculate_diff_score',
     'format_average_score',
     'get_average_score',
+    'ScoringContext',
 ]
 
 
@@ -28,32 +34,111 @@ def calculate_lcs_score(lcs_len: int, a_len: int, b_len: int) -> int:
         return ceil(lcs_len / max(a_len, b_len) * (MAX_SCORE - 1))
 
 
-def calculate_char_diff_score(a: str, b: str) -> int:
+def count_overlap[T](a: Counter[T], b: Counter[T]) -> int:
+    """Return the size of the intersection of two multisets."""
+    return sum((a & b).values())
+
+
+class ScoringContext:
+    """
+    A string prepared for scoring against other strings: tokenized and normalized once,
+    so that the work is shared when it is scored against many options.
+    """
+
+    text: str
+    char_pattern: LcsPattern[str]
+    cj_words: list[str]
+    cj_words_len: int
+    fuzzy_words: list[FuzzyWord]
+    lower_words: list[str]
+    chars: Counter[str]
+    cj_word_chars: Counter[str]
+    lower_word_bag: Counter[str]
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.char_pattern = LcsPattern(text)
+        self.cj_words = tokenize(text, punctuation=False, whitespace=False, cj=True)
+        self.cj_words_len = sum(map(len, self.cj_words))
+        self.fuzzy_words = list(map(FuzzyWord, self.cj_words))
+        self.lower_words = [word.lower() for word in tokenize(text, punctuation=False, whitespace=False, cj=False)]
+        self.chars = Counter(text)
+        self.cj_word_chars = Counter(char for word in self.cj_words for char in word)
+        self.lower_word_bag = Counter(self.lower_words)
+
+    def score(self, other: ScoringContext) -> int:
+        """Return the score based on the diff between the two strings."""
+        return min(
+            calculate_char_diff_score(self, other),
+            calculate_fuzzy_word_diff_score(self, other),
+            calculate_word_mistake_diff_score(self, other),
+        )
+
+    def get_upper_bound(self, other: ScoringContext) -> int:
+        """
+        Return an upper bound of the score that is cheap to compute: the common subsequences are bounded
+        by the overlap of the character multisets, and the number of mistakes by the overlap of the word bags.
+        """
+        return min(
+            calculate_lcs_score(count_overlap(self.chars, other.chars), len(self.text), len(other.text)),
+            calculate_lcs_score(
+                count_overlap(self.cj_word_chars, other.cj_word_chars),
+                self.cj_words_len,
+                other.cj_words_len,
+            ),
+            calculate_mistake_score(
+                max(len(self.lower_words), len(other.lower_words))
+                - count_overlap(self.lower_word_bag, other.lower_word_bag)
+            ),
+        )
+
+    def score_many(self, options: Iterable[str]) -> list[int]:
+        """Return the scores based on the diff between the string and each of the options."""
+        return [self.score(ScoringContext(option)) for option in options]
+
+    def find_best(self, options: Sequence[str], min_score: int = 0) -> tuple[int, int] | None:
+        """
+        Return the index and the score of the first option with the highest score, provided that it is at least
+        `min_score`. The options are scored in the descending order of their cheap upper bounds, so that the options
+        that cannot improve on the best score found so far are skipped.
+        """
+        contexts = [ScoringContext(option) for option in options]
+        bounds = [self.get_upper_bound(context) for context in contexts]
+        best_index: int | None = None
+        best_score = min_score - 1
+        for index in sorted(range(len(contexts)), key=lambda option_index: -bounds[option_index]):
+            if bounds[index] < best_score or best_score == MAX_SCORE:
+                break
+            if bounds[index] == best_score and (best_index is None or index > best_index):
+                continue
+            score = self.score(contexts[index])
+            if score > best_score or (score == best_score and best_index is not None and index < best_index):
+                best_index, best_score = index, score
+        return (best_index, best_score) if best_index is not None else None
+
+
+def calculate_char_diff_score(a: ScoringContext, b: ScoringContext) -> int:
     """Return the score based on the longest common subsequence of two strings."""
-    return calculate_lcs_score(lcs_length(a, b), len(a), len(b))
+    return calculate_lcs_score(a.char_pattern.lcs_length(b.text), len(a.text), len(b.text))
 
 
-def calculate_fuzzy_word_diff_score(a: str, b: str, cj: bool) -> int:
+def calculate_fuzzy_word_diff_score(a: ScoringContext, b: ScoringContext) -> int:
     """
     Calculate the score based on the total length of the longest common subsequences of characters
-    within fuzzily aligned words from two strings.
+    within fuzzily aligned words (including individual CJ characters) from two strings.
     """
-    a_words, b_words = (tokenize(sentence, punctuation=False, whitespace=False, cj=cj) for sentence in (a, b))
-    a_len, b_len = (sum(map(len, words)) for words in (a_words, b_words))
     lcs_len = 0
-    for a_index, b_index in lcs_indices(map(FuzzyWord, a_words), map(FuzzyWord, b_words), FuzzyWord.compare):
-        lcs_len += lcs_length(a_words[a_index], b_words[b_index])
-    return calculate_lcs_score(lcs_len, a_len, b_len)
+    for a_index, b_index in fuzzy_lcs_indices(a.fuzzy_words, b.fuzzy_words):
+        lcs_len += lcs_length(a.cj_words[a_index], b.cj_words[b_index])
+    return calculate_lcs_score(lcs_len, a.cj_words_len, b.cj_words_len)
 
 
-def calculate_word_mistake_diff_score(a: str, b: str, cj: bool) -> int:
+def calculate_word_mistake_diff_score(a: ScoringContext, b: ScoringContext) -> int:
     """Return the score based on the number of mistakes computed from a word-level diff between two strings."""
-    a_words, b_words = ([word.lower() for word in tokenize(sentence, punctuation=False, whitespace=False, cj=cj)]
-                        for sentence in (a, b))
     a_diff: list[str] = []
     b_diff: list[str] = []
     mistakes = 0
-    for a_tokens, b_tokens in diff(a_words, b_words):
+    for a_tokens, b_tokens in diff(a.lower_words, b.lower_words):
         mistakes += max(len(a_tokens), len(b_tokens))
         a_diff.extend(a_tokens)
         b_diff.extend(b_tokens)
@@ -63,11 +148,7 @@ def calculate_word_mistake_diff_score(a: str, b: str, cj: bool) -> int:
 
 def calculate_diff_score(a: str, b: str) -> int:
     """Return the score based on the diff between two strings."""
-    return min(
-        calculate_char_diff_score(a, b),
-        calculate_fuzzy_word_diff_score(a, b, cj=True),
-        calculate_word_mistake_diff_score(a, b, cj=False),
-    )
+    return ScoringContext(a).score(ScoringContext(b))
 
 
 def get_average_score(exam: TextExam | DialogueExam) -> float:
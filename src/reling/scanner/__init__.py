@@ -8,7 +8,7 @@ if TYPE_CHECKING:
     import cv2
 
 from reling.db.models import Language
-from reling.gpt import GPTClient
+from reling.gpt import GptCallSite, GPTClient
 from reling.helpers.typer import typer_raise, typer_raise_import
 from reling.types import Image
 from reling.utils.transformers import strip
@@ -69,6 +69,7 @@ class Scanner:
             image=image,
             creative=False,
             transformers=[strip],
+            call_site=GptCallSite.SCANNING,
         ))[0]
 
 
@@ -1,9 +1,5 @@
-from typing import Literal
-
-from openai import OpenAI
-
+from reling.backends import Backend, get_backend
 from reling.db.models import Language
-from reling.helpers.openai import openai_handler
 from reling.helpers.pyaudio import get_audio, get_stream
 from reling.types import Speed
 from .tts_client import TTSClient
@@ -15,17 +11,15 @@ __all__ = [
 
 CHANNELS = 1
 RATE = 24000
-CHUNK_SIZE = 1024
-RESPONSE_FORMAT: Literal['pcm'] = 'pcm'
 
 
 class OpenAITTSClient(TTSClient):
-    _client: OpenAI
+    _backend: Backend
     _model: str
     _language: Language
 
     def __init__(self, *, api_key: str, model: str, language: Language) -> None:
-        self._client = OpenAI(api_key=api_key)
+        self._backend = get_backend(api_key)
         self._model = model
         self._language = language
 
@@ -39,14 +33,11 @@ class OpenAITTSClient(TTSClient):
                 rate=RATE,
                 output=True,
             ) as stream,
-            openai_handler(),
         ):
-            response = self._client.audio.speech.create(
+            stream.write(self._backend.synthesize(
                 model=self._model,
-                voice=voice.value,  # type: ignore
-                response_format=RESPONSE_FORMAT,
-                input=text,
+                text=text,
+                voice=voice.value,
                 speed=speed.value,
                 instructions=f'Read in {self._language.name}.',
-            )
-            stream.write(response.content)
+            ))
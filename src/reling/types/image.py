@@ -1,3 +1,5 @@
+from hashlib import sha256
+
 __all__ = [
     'Image',
 ]
@@ -11,3 +13,6 @@ class Image:
 
     def get_url(self) -> str:
         return self._url
+
+    def get_digest(self) -> str:
+        return sha256(self._url.encode()).hexdigest()
@@ -0,0 +1,26 @@
+from asyncio import AbstractEventLoop, new_event_loop, run_coroutine_threadsafe
+from concurrent.futures import Future
+from threading import Lock, Thread
+from typing import Coroutine
+
+__all__ = [
+    'run_in_background',
+]
+
+LOOP: AbstractEventLoop | None = None
+LOOP_LOCK = Lock()
+
+
+def get_background_loop() -> AbstractEventLoop:
+    """Return the event loop running in a background daemon thread, starting it if necessary."""
+    global LOOP
+    with LOOP_LOCK:
+        if LOOP is None:
+            LOOP = new_event_loop()
+            Thread(target=LOOP.run_forever, daemon=True).start()
+        return LOOP
+
+
+def run_in_background[T](coroutine: Coroutine[None, None, T]) -> Future[T]:
+    """Schedule the coroutine on the background event loop and return a future of its result."""
+    return run_coroutine_threadsafe(coroutine, get_background_loop())
@@ -0,0 +1,47 @@
+from typing import Hashable, Iterable, Sequence
+
+__all__ = [
+    'lcs_length',
+    'LcsPattern',
+]
+
+
+class LcsPattern[T: Hashable]:
+    """
+    Sequence prepared for computing the lengths of its longest common subsequences with other sequences
+    by the bit-parallel algorithm of Allison–Dix and Hyyrö, with Python integers serving as bit vectors.
+    Each step processes an item of the other sequence against the whole pattern at once.
+    """
+
+    _length: int
+    _full_mask: int
+    _match_masks: dict[T, int]
+
+    def __init__(self, pattern: Iterable[T]) -> None:
+        self._length = 0
+        self._match_masks = {}
+        for index, item in enumerate(pattern):
+            self._match_masks[item] = self._match_masks.get(item, 0) | (1 << index)
+            self._length = index + 1
+        self._full_mask = (1 << self._length) - 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def lcs_length(self, other: Iterable[T]) -> int:
+        """Return the length of the longest common subsequence of the pattern and the other sequence."""
+        full_mask = self._full_mask
+        match_masks = self._match_masks
+        vector = full_mask  # Zero bits mark the pattern positions where the LCS length increases
+        for item in other:
+            if match_mask := match_masks.get(item):
+                matched = vector & match_mask
+                vector = ((vector + matched) | (vector - matched)) & full_mask
+        return self._length - vector.bit_count()
+
+
+def lcs_length[T: Hashable](a: Sequence[T], b: Sequence[T]) -> int:
+    """Return the length of the longest common subsequence of two sequences."""
+    # The longer sequence is used as the pattern, since the bit operations are cheaper than the iterations
+    pattern, other = (a, b) if len(a) >= len(b) else (b, a)
+    return LcsPattern(pattern).lcs_length(other)
@@ -1,3 +1,4 @@
+from enum import IntEnum
 import re
 from typing import Generator
 from unicodedata import category, normalize
@@ -14,6 +15,32 @@ __all__ = [
 ]
 
 CJ = re.compile(r'[\u4E00-\u9FFF\u3040-\u30FF]')
+APOSTROPHES = ["'", '’']
+
+
+class CharClass(IntEnum):
+    WORD = 0
+    PUNCTUATION = 1
+    WHITESPACE = 2
+    CJ = 3
+    APOSTROPHE = 4  # Punctuation unless surrounded by non-whitespace characters
+
+
+class CharClassTable(dict[str, CharClass]):
+    """Table of character classes as used by `tokenize`, filled in on demand."""
+
+    def __missing__(self, char: str) -> CharClass:
+        char_class = self[char] = (
+            CharClass.APOSTROPHE if char in APOSTROPHES
+            else CharClass.PUNCTUATION if is_punctuation(char)
+            else CharClass.WHITESPACE if is_whitespace(char)
+            else CharClass.CJ if is_cj(char)
+            else CharClass.WORD
+        )
+        return char_class
+
+
+CHAR_CLASSES = CharClassTable()
 
 
 def universal_normalize(string: str) -> str:
@@ -50,29 +77,31 @@ def is_cj(char: str, _before: str | None = None, _after: str | None = None) -> b
 
 def tokenize(string: str, *, punctuation: bool = True, whitespace: bool = True, cj: bool = True) -> list[str]:
     """Tokenize a string into words, punctuation, whitespace, and individual CJ characters."""
+    classes = list(map(CHAR_CLASSES.__getitem__, string))
+    included = [False, punctuation, whitespace, cj]
+    last_index = len(string) - 1
     tokens: list[str] = []
-    current: list[str] = []
-    for index, char in enumerate(string):
-        for (checker, should_include) in [
-            (is_punctuation, punctuation),
-            (is_whitespace, whitespace),
-            (is_cj, cj),
-        ]:
-            if checker(
-                    char,
-                    string[index - 1] if index > 0 else None,
-                    string[index + 1] if index + 1 < len(string) else None,
-            ):
-                if current:
-                    tokens.append(''.join(current))
-                    current.clear()
-                if should_include:
-                    tokens.append(char)
-                break
+    word_start: int | None = None
+    for index, char_class in enumerate(classes):
+        if char_class == CharClass.APOSTROPHE:
+            char_class = (
+                CharClass.WORD
+                if 0 < index < last_index
+                and classes[index - 1] != CharClass.WHITESPACE
+                and classes[index + 1] != CharClass.WHITESPACE
+                else CharClass.PUNCTUATION
+            )
+        if char_class == CharClass.WORD:
+            if word_start is None:
+                word_start = index
         else:
-            current.append(char)
-    if current:
-        tokens.append(''.join(current))
+            if word_start is not None:
+                tokens.append(string[word_start:index])
+                word_start = None
+            if included[char_class]:
+                tokens.append(string[index])
+    if word_start is not None:
+        tokens.append(string[word_start:])
     return tokens
 
 
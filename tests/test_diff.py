@@ -0,0 +1,88 @@
+from itertools import product
+from random import Random
+
+from lcs2 import lcs_indices
+from rich.text import Text
+
+from reling.helpers.colors import default, green, red
+from reling.helpers.diff import DiffType, highlight_diff
+from reling.helpers.fuzzy_word import FuzzyWord
+
+SEED = 0
+CASES = 300
+WORDS = [
+    'the', 'The', 'cat', 'cats', 'sat', 'on', 'mat',
+    'мама', 'мыла', 'раму',
+    '漢字', 'かな',
+    ',', '.', '!', "'s",
+]
+MAX_WORDS = 8
+EXAMPLES = [
+    ('', ''),
+    ('', 'The cat sat on the mat.'),
+    ('The cat sat on the mat.', ''),
+    ('The cat sat on the mat.', 'The cat sat on the mat.'),
+    ('abc', 'xyz'),
+    ('Мама мыла раму.', 'The cat sat on the mat.'),
+    ('the cat sat on the mat.', 'The Cat sat on the MAT.'),
+    ('The cat sat on the mat', 'The cat, sat on the mat!'),
+    ("The cat's mat.", 'The cats mat...'),
+]
+
+
+def reference_highlight_diff(worse: str, better: str, diff_type: DiffType = DiffType.TOKEN) -> tuple[Text, Text]:
+    """The original implementation of `highlight_diff`, summing the segments one by one."""
+    worse_tokens, better_tokens = (diff_type.get_tokenizer()(string) for string in (worse, better))
+    if diff_type == DiffType.CHAR:
+        lcs = lcs_indices(worse_tokens, better_tokens)
+    else:
+        lcs = lcs_indices(
+            list(map(FuzzyWord, worse_tokens)),
+            list(map(FuzzyWord, better_tokens)),
+            weight=FuzzyWord.compare,
+        )
+    worse_segments: list[Text] = []
+    better_segments: list[Text] = []
+    worse_cursor = better_cursor = 0
+    for worse_index, better_index in lcs + [(len(worse_tokens), len(better_tokens))]:
+        worse_segments.append(red(''.join(worse_tokens[worse_cursor:worse_index])))
+        better_segments.append(green(''.join(better_tokens[better_cursor:better_index])))
+        if (worse_index, better_index) == (len(worse_tokens), len(better_tokens)):
+            break
+        if diff_type == DiffType.CHAR:
+            worse_segments.append(default(worse_tokens[worse_index]))
+            better_segments.append(default(better_tokens[better_index]))
+        else:
+            worse_segment, better_segment = reference_highlight_diff(
+                worse_tokens[worse_index],
+                better_tokens[better_index],
+                DiffType.CHAR,
+            )
+            worse_segments.append(worse_segment)
+            better_segments.append(better_segment)
+        worse_cursor = worse_index + 1
+        better_cursor = better_index + 1
+    return sum(worse_segments, Text('')), sum(better_segments, Text(''))
+
+
+def get_styled_chars(text: Text) -> list[tuple[str, str]]:
+    """Return the characters of the text with their styles, regardless of how the text is split into spans."""
+    styles = [''] * len(text.plain)
+    for span in text.spans:
+        for index in range(span.start, span.end):
+            styles[index] = str(span.style)
+    return list(zip(text.plain, styles))
+
+
+def generate_sentence(rng: Random) -> str:
+    """Generate a sentence of random words and punctuation, so that random pairs share some of their tokens."""
+    return ' '.join(rng.choices(WORDS, k=rng.randint(0, MAX_WORDS)))
+
+
+def test_highlight_diff_matches_reference() -> None:
+    rng = Random(SEED)
+    pairs = EXAMPLES + [(generate_sentence(rng), generate_sentence(rng)) for _ in range(CASES)]
+    for (worse, better), diff_type in product(pairs, DiffType):
+        assert [get_styled_chars(text) for text in highlight_diff(worse, better, diff_type)] == [
+            get_styled_chars(text) for text in reference_highlight_diff(worse, better, diff_type)
+        ]
@@ -0,0 +1,27 @@
+from random import Random
+
+from lcs2 import lcs_length as reference_lcs_length
+
+from reling.utils.lcs import lcs_length, LcsPattern
+
+SEED = 0
+CASES = 300
+ALPHABETS = ['ab', 'abcde', 'aAbBéЖ漢 .,']
+
+
+def test_lcs_length_edge_cases() -> None:
+    assert lcs_length('', '') == 0
+    assert lcs_length('abc', '') == 0
+    assert lcs_length('', 'abc') == 0
+    assert lcs_length('abc', 'abc') == 3
+    assert lcs_length('abc', 'def') == 0
+    assert lcs_length(['one', 'two', 'three'], ['two', 'three', 'four']) == 2
+
+
+def test_lcs_length_matches_reference() -> None:
+    rng = Random(SEED)
+    for _ in range(CASES):
+        alphabet = rng.choice(ALPHABETS)
+        a, b = (''.join(rng.choices(alphabet, k=rng.randint(0, 40))) for _ in range(2))
+        assert lcs_length(a, b) == reference_lcs_length(a, b)
+        assert LcsPattern(a).lcs_length(b) == LcsPattern(b).lcs_length(a) == lcs_length(a, b)
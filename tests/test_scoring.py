@@ -1,11 +1,75 @@
+from math import ceil, floor
 from pathlib import Path
+from random import Random
+
+from lcs2 import diff, lcs_indices, lcs_length
 
 from reling.config import MAX_SCORE
-from reling.helpers.scoring import calculate_diff_score
+from reling.helpers.fuzzy_word import FuzzyWord
+from reling.helpers.scoring import calculate_diff_score, ScoringContext
 from reling.utils.csv import read_csv
+from reling.utils.strings import tokenize
 
 DATA = Path(__file__).parent / 'scoring.tsv'
 DELIMITER = '\t'
+UNRELATED_OPTIONS = 3
+SEED = 0
+FIND_BEST_CASES = 300
+MAX_OPTIONS = 8
+MAX_EDITS = 6
+
+
+def reference_lcs_score(lcs_len: int, a_len: int, b_len: int) -> int:
+    return MAX_SCORE if lcs_len == a_len == b_len else ceil(lcs_len / max(a_len, b_len) * (MAX_SCORE - 1))
+
+
+def reference_diff_score(a: str, b: str) -> int:
+    """The original diff-based implementation of `calculate_diff_score`."""
+    a_words, b_words = (tokenize(sentence, punctuation=False, whitespace=False, cj=True) for sentence in (a, b))
+    fuzzy_lcs_len = sum(
+        lcs_length(a_words[a_index], b_words[b_index])
+        for a_index, b_index in lcs_indices(map(FuzzyWord, a_words), map(FuzzyWord, b_words), FuzzyWord.compare)
+    )
+    a_lower, b_lower = ([word.lower() for word in tokenize(sentence, punctuation=False, whitespace=False, cj=False)]
+                        for sentence in (a, b))
+    a_diff: list[str] = []
+    b_diff: list[str] = []
+    mistakes = 0
+    for a_tokens, b_tokens in diff(a_lower, b_lower):
+        mistakes += max(len(a_tokens), len(b_tokens))
+        a_diff.extend(a_tokens)
+        b_diff.extend(b_tokens)
+    mistakes -= lcs_length(a_diff, b_diff)
+    return min(
+        reference_lcs_score(lcs_length(a, b), len(a), len(b)),
+        reference_lcs_score(fuzzy_lcs_len, sum(map(len, a_words)), sum(map(len, b_words))),
+        floor(MAX_SCORE * ((1 - 1 / MAX_SCORE) ** mistakes)),
+    )
+
+
+def reference_find_best(text: str, options: list[str], min_score: int) -> tuple[int, int] | None:
+    """Score the text against every option and return the first best one, as `find_best` did before pruning."""
+    scores = [calculate_diff_score(text, option) for option in options]
+    if not scores or max(scores) < min_score:
+        return None
+    return scores.index(max(scores)), max(scores)
+
+
+def mutate(rng: Random, text: str) -> str:
+    """Delete, duplicate, or swap the case of a few random characters of the text."""
+    chars = list(text)
+    for _ in range(rng.randint(0, MAX_EDITS)):
+        if not chars:
+            break
+        index = rng.randrange(len(chars))
+        match rng.randrange(3):
+            case 0:
+                del chars[index]
+            case 1:
+                chars.insert(index, chars[index])
+            case 2:
+                chars[index] = chars[index].swapcase()
+    return ''.join(chars)
 
 
 def test_scoring() -> None:
@@ -14,3 +78,33 @@ def test_scoring() -> None:
         max_expected = round(float(case['max']) * MAX_SCORE)
         assert min_expected <= calculate_diff_score(case['a'], case['b']) <= max_expected
         assert min_expected <= calculate_diff_score(case['b'], case['a']) <= max_expected
+
+
+def test_scoring_context() -> None:
+    cases = list(read_csv(DATA, ['a', 'b', 'min', 'max'], empty_as_none=False, delimiter=DELIMITER))
+    for index, case in enumerate(cases):
+        options = [case['a'], case['b'], *(other['b'] for other in cases[index + 1:index + 1 + UNRELATED_OPTIONS])]
+        assert ScoringContext(case['a']).score_many(options) == [
+            reference_diff_score(case['a'], option) for option in options
+        ]
+
+
+def test_find_best() -> None:
+    texts = [text for case in read_csv(DATA, ['a', 'b', 'min', 'max'], empty_as_none=False, delimiter=DELIMITER)
+             for text in (case['a'], case['b'])]
+    rng = Random(SEED)
+    for _ in range(FIND_BEST_CASES):
+        text = rng.choice(texts)
+        options = [mutate(rng, text) for _ in range(rng.randint(1, MAX_OPTIONS))]
+        options += rng.choices(options, k=rng.randint(0, 2))  # Ties
+        rng.shuffle(options)
+        min_score = rng.randint(0, MAX_SCORE)
+        assert ScoringContext(text).find_best(options, min_score) == reference_find_best(text, options, min_score)
+    context = ScoringContext('The cat sat on the mat.')
+    assert context.find_best([]) is None
+    assert context.find_best(['The cat sat on the mat.']) == (0, MAX_SCORE)
+    assert context.find_best(['The cat sat on a mat.', 'The cat sat on a mat.']) == (
+        0,
+        calculate_diff_score('The cat sat on the mat.', 'The cat sat on a mat.'),
+    )
+    assert context.find_best(['A dog ran.'], min_score=MAX_SCORE) is None
@@ -0,0 +1,58 @@
+from itertools import product
+from random import Random
+
+from reling.utils.strings import is_cj, is_punctuation, is_whitespace, tokenize
+
+SEED = 0
+CASES = 2000
+CHARS = 'aZé ЖЯ漢字かカ　 \t\n\'’.,!?-—«»゠・1'
+EXAMPLES = [
+    '',
+    "Don't stop.",
+    "'quoted' words",
+    "rock 'n' roll",
+    'end with apostrophe\'',
+    '村には、美味しい食べ物がたくさんありました。',
+    'Привіт, як справи?',
+    'mixed 漢字 and words',
+]
+
+
+def reference_tokenize(string: str, *, punctuation: bool, whitespace: bool, cj: bool) -> list[str]:
+    """The original checker-based implementation of `tokenize`."""
+    tokens: list[str] = []
+    current: list[str] = []
+    for index, char in enumerate(string):
+        for (checker, should_include) in [
+            (is_punctuation, punctuation),
+            (is_whitespace, whitespace),
+            (is_cj, cj),
+        ]:
+            if checker(
+                    char,
+                    string[index - 1] if index > 0 else None,
+                    string[index + 1] if index + 1 < len(string) else None,
+            ):
+                if current:
+                    tokens.append(''.join(current))
+                    current.clear()
+                if should_include:
+                    tokens.append(char)
+                break
+        else:
+            current.append(char)
+    if current:
+        tokens.append(''.join(current))
+    return tokens
+
+
+def test_tokenize_matches_reference() -> None:
+    rng = Random(SEED)
+    strings = EXAMPLES + [''.join(rng.choices(CHARS, k=rng.randint(1, 30))) for _ in range(CASES)]
+    for string, (punctuation, whitespace, cj) in product(strings, product([False, True], repeat=3)):
+        assert tokenize(string, punctuation=punctuation, whitespace=whitespace, cj=cj) == reference_tokenize(
+            string,
+            punctuation=punctuation,
+            whitespace=whitespace,
+            cj=cj,
+        )